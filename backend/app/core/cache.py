@@ -0,0 +1,164 @@
+"""
+Small in-process read-through cache for reference data
+(weights, skills, professors, TAs). The PDF checker routes also keep their
+content-hash keyed reports in a TTLCache from here ("checker_results").
+
+Usage:
+    @cached("tas")
+    def get_all_tas(): ...
+
+    # after a successful write
+    invalidate("tas", "skills")
+
+Every named cache has a TTL and a size bound, and keeps hit/miss counters
+exposed through cache_stats(). Caches are per process: with several
+uvicorn workers a write only invalidates the worker that handled it, the
+others catch up when their entries expire (REFERENCE_CACHE_TTL).
+
+Cached values are shared between callers and must be treated as read-only.
+
+invalidate() also bumps the shared per-resource data version counters in
+the database (app/core/data_version.py). Resources that are not cached here
+("courses", "assignments") are just versioned; the counters drive the ETags
+of the read-heavy endpoints (see app/core/etag.py), so unlike the caches
+they are consistent across workers.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core import data_version
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, name: str, ttl: float, maxsize: int):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # bumped by clear(); a value computed before an invalidation
+        # must not be stored after it
+        self.generation = 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+            self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_caches: Dict[str, TTLCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name: str, ttl: Optional[float] = None, maxsize: int = 64) -> TTLCache:
+    """Return the named cache, creating it on first use."""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = TTLCache(
+                name,
+                ttl=settings.REFERENCE_CACHE_TTL if ttl is None else ttl,
+                maxsize=maxsize,
+            )
+            _caches[name] = cache
+        return cache
+
+
+def cached(name: str, ttl: Optional[float] = None, maxsize: int = 64) -> Callable:
+    """
+    Read-through decorator. The cache key is built from the call arguments,
+    so e.g. get_all_professors(include_ta_details=False) is cached separately.
+    Disabled entirely when REFERENCE_CACHE_TTL is 0.
+    """
+    def decorator(fn: Callable) -> Callable:
+        cache = get_cache(name, ttl=ttl, maxsize=maxsize)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if cache.ttl <= 0:
+                return fn(*args, **kwargs)
+            key = (args, tuple(sorted(kwargs.items())))
+            value = cache.get(key)
+            if value is _MISSING:
+                generation = cache.generation
+                value = fn(*args, **kwargs)
+                cache.set(key, value, generation=generation)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*names: str) -> None:
+    """
+    Drop every entry of the given caches and bump their data versions.
+    Call after the write is committed.
+    """
+    for name in names:
+        cache = _caches.get(name)
+        if cache is not None:
+            cache.clear()
+    data_version.bump(*names)
+
+
+def invalidate_all() -> None:
+    for cache in list(_caches.values()):
+        cache.clear()
+    data_version.bump(data_version.ALL_RESOURCES)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -0,0 +1,257 @@
+"""
+Bounded process pool for the PDF signature checkers.
+
+The checkers are CPU-bound (rendering, OpenCV). Running them inside an
+`async def` route blocks the event loop, so the routes hand them to this
+pool instead:
+
+    report = await run_checker_job(run_signature_checker, pdf_path)
+
+- At most CHECKER_WORKERS jobs run at once (one process each).
+- At most CHECKER_MAX_PENDING jobs are running or waiting; beyond that the
+  request is rejected right away with 503 + Retry-After.
+- A job not finished after CHECKER_JOB_TIMEOUT seconds answers 504. A
+  worker stuck in native code cannot be interrupted, so the whole pool is
+  terminated and replaced: its jobs fail (the others in flight get 503,
+  retry) and every slot is freed.
+- Workers check each PDF in-process (no nested fallback page pool), so at
+  most CHECKER_WORKERS processes run checks, and are replaced after
+  CHECKER_MAX_TASKS_PER_CHILD jobs.
+
+Batch checks reserve several slots up front (reserve_slots) and run their
+jobs through run_reserved_job, so one batch cannot starve single uploads
+beyond its reservation.
+
+Streaming checks (iter_checker) run in the same pool: iterate_in_pool
+sends every item the generator yields back through a pipe, under the same
+CHECKER_JOB_TIMEOUT (for the whole stream). Callers hold a slot from
+reserve_slots() for the whole stream.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+_pending = 0
+_rejected = 0
+_timed_out = 0
+
+# iterate_in_pool waits for the next item in steps of at most this (s)
+_STREAM_POLL_SECONDS = 1.0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            # spawn: the server process has threads and an initialized pdfium
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, settings.CHECKER_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                max_tasks_per_child=max(1, settings.CHECKER_MAX_TASKS_PER_CHILD),
+            )
+        return _pool
+
+
+def _init_worker() -> None:
+    # the pool already bounds concurrency: no nested fallback pool per job.
+    # Trade-off: a long scanned upload is checked on one core, its latency
+    # does not shrink with idle workers; they stay free for other uploads.
+    from app.services import checker_engine
+    checker_engine.FALLBACK_MAX_WORKERS = 1
+
+
+def _discard_pool(broken: ProcessPoolExecutor, terminate: bool = False) -> None:
+    """
+    Forget a pool whose worker died (e.g. OOM kill); the next job starts a
+    fresh one. terminate=True also kills its workers (a job is stuck): their
+    futures fail with BrokenProcessPool, which releases their slots.
+    """
+    global _pool
+    with _lock:
+        if _pool is broken:
+            _pool = None
+    if terminate:
+        for process in list((broken._processes or {}).values()):
+            process.terminate()
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _release(_: Optional[Future] = None) -> None:
+    release_slots(1)
+
+
+def reserve_slots(wanted: int = 1) -> int:
+    """
+    Reserve up to `wanted` job slots without waiting. Returns how many were
+    granted (0 when the pool is saturated). Pair with release_slots().
+    """
+    global _pending, _rejected
+    with _lock:
+        granted = max(0, min(wanted, settings.CHECKER_MAX_PENDING - _pending))
+        if granted == 0:
+            _rejected += 1
+        _pending += granted
+        return granted
+
+
+def release_slots(n: int) -> None:
+    global _pending
+    with _lock:
+        _pending -= n
+
+
+def busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="The PDF checker is busy, please retry shortly.",
+        headers={"Retry-After": "5"},
+    )
+
+
+async def _run_in_pool(fn: Callable[..., Any], args, kwargs, release_when_done: bool) -> Any:
+    global _timed_out
+    pool = _get_pool()
+    try:
+        future = pool.submit(functools.partial(fn, *args, **kwargs))
+    except BrokenProcessPool:
+        if release_when_done:
+            _release()
+        _discard_pool(pool)
+        raise HTTPException(status_code=503, detail="The PDF checker is restarting, please retry.")
+    except Exception:
+        if release_when_done:
+            _release()
+        raise
+    if release_when_done:
+        future.add_done_callback(_release)
+
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=settings.CHECKER_JOB_TIMEOUT)
+    except asyncio.TimeoutError:
+        with _lock:
+            _timed_out += 1
+        logger.error("Checker job exceeded %ss, restarting the checker pool", settings.CHECKER_JOB_TIMEOUT)
+        _discard_pool(pool, terminate=True)
+        raise HTTPException(status_code=504, detail="The PDF check took too long and was abandoned.")
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        logger.error("Checker worker process died, pool restarted")
+        raise HTTPException(status_code=503, detail="The PDF checker crashed, please retry.")
+
+
+async def run_checker_job(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run fn(*args, **kwargs) in the checker pool and await its result.
+    fn and its arguments must be picklable (module-level function, plain data).
+    Raises 503 right away when the pool is saturated.
+    """
+    if not reserve_slots(1):
+        raise busy_error()
+    return await _run_in_pool(fn, args, kwargs, release_when_done=True)
+
+
+async def run_reserved_job(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Like run_checker_job, for callers already holding slots from
+    reserve_slots() (a batch keeps its slots for the whole batch).
+    """
+    return await _run_in_pool(fn, args, kwargs, release_when_done=False)
+
+
+def _stream_job(conn, fn: Callable[..., Iterator[Any]], args, kwargs) -> None:
+    """Pool side of iterate_in_pool: send every item of fn(*args, **kwargs), then None."""
+    gen = fn(*args, **kwargs)
+    try:
+        for item in gen:
+            conn.send(item)
+        conn.send(None)
+    except (BrokenPipeError, EOFError, ConnectionResetError):
+        # the API side stopped listening: end the check after this step
+        pass
+    finally:
+        gen.close()
+        conn.close()
+
+
+async def iterate_in_pool(fn: Callable[..., Iterator[Any]], *args, **kwargs) -> AsyncIterator[Any]:
+    """
+    Run the generator fn(*args, **kwargs) in the checker pool and yield its
+    items as they come (they must be picklable, and never None). For
+    callers holding a slot from reserve_slots().
+
+    Past CHECKER_JOB_TIMEOUT for the whole stream, the pool is replaced as
+    for a stuck job and 504 is raised. Stopping the iteration early (e.g.
+    the client went away) closes the pipe, which ends the check after its
+    current step.
+    """
+    global _timed_out
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    ours, theirs = multiprocessing.Pipe()
+    try:
+        future = pool.submit(_stream_job, theirs, fn, args, kwargs)
+    except BrokenProcessPool:
+        ours.close()
+        theirs.close()
+        _discard_pool(pool)
+        raise HTTPException(status_code=503, detail="The PDF checker is restarting, please retry.")
+    # our copy of the worker's end must stay open until the job is picked up
+    future.add_done_callback(lambda _: theirs.close())
+
+    deadline = loop.time() + settings.CHECKER_JOB_TIMEOUT
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                with _lock:
+                    _timed_out += 1
+                logger.error("Streaming check exceeded %ss, restarting the checker pool",
+                             settings.CHECKER_JOB_TIMEOUT)
+                _discard_pool(pool, terminate=True)
+                raise HTTPException(status_code=504, detail="The PDF check took too long and was abandoned.")
+            if await loop.run_in_executor(None, ours.poll, min(remaining, _STREAM_POLL_SECONDS)):
+                try:
+                    item = ours.recv()
+                except EOFError:
+                    item = None
+                if item is None:
+                    break
+                yield item
+            elif future.done():
+                break
+        try:
+            # a check that failed mid-stream raises its exception here
+            await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            logger.error("Checker worker process died, pool restarted")
+            raise HTTPException(status_code=503, detail="The PDF checker crashed, please retry.")
+    finally:
+        ours.close()
+
+
+def pool_stats() -> Dict[str, Any]:
+    with _lock:
+        return {
+            "workers": settings.CHECKER_WORKERS,
+            "max_pending": settings.CHECKER_MAX_PENDING,
+            "job_timeout_seconds": settings.CHECKER_JOB_TIMEOUT,
+            "pending": _pending,
+            "rejected": _rejected,
+            "timed_out": _timed_out,
+        }
@@ -11,6 +11,30 @@ class Settings:
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "Khalil2003")
     DB_NAME: str = os.getenv("DB_NAME", "TA_Assignment_System")
 
+    # "mysql" (default) or "sqlite" for an embedded, in-process database
+    DB_BACKEND: str = os.getenv("DB_BACKEND", "mysql").lower()
+    # ":memory:" keeps the whole database in RAM; use a file path for
+    # multi-threaded load tests
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", ":memory:")
+    SQLITE_SEED: bool = os.getenv("SQLITE_SEED", "false").lower() in ("1", "true", "yes")
+
+    # Seconds reference data (weights, skills, professors, TAs) stays cached; 0 disables
+    REFERENCE_CACHE_TTL: float = float(os.getenv("REFERENCE_CACHE_TTL", 300))
+
+    # PDF checker jobs run in a separate process pool (app/core/checker_pool.py)
+    CHECKER_WORKERS: int = int(os.getenv("CHECKER_WORKERS", min(2, os.cpu_count() or 1)))
+    # running + waiting jobs allowed before new uploads get 503
+    CHECKER_MAX_PENDING: int = int(os.getenv("CHECKER_MAX_PENDING", 8))
+    CHECKER_JOB_TIMEOUT: float = float(os.getenv("CHECKER_JOB_TIMEOUT", 120))
+    # worker processes are replaced after this many jobs (pdfium/OpenCV memory)
+    CHECKER_MAX_TASKS_PER_CHILD: int = int(os.getenv("CHECKER_MAX_TASKS_PER_CHILD", 100))
+    CHECKER_MAX_UPLOAD_MB: float = float(os.getenv("CHECKER_MAX_UPLOAD_MB", 50))
+    # mask PNGs per /debug ZIP; the rest are only counted in report.json
+    CHECKER_DEBUG_MAX_MASKS: int = int(os.getenv("CHECKER_DEBUG_MAX_MASKS", 100))
+    # checker reports cached by PDF content hash; 0 disables
+    CHECKER_RESULT_CACHE_TTL: float = float(os.getenv("CHECKER_RESULT_CACHE_TTL", 3600))
+    CHECKER_RESULT_CACHE_SIZE: int = int(os.getenv("CHECKER_RESULT_CACHE_SIZE", 256))
+
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecret")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
 
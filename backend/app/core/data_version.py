@@ -0,0 +1,90 @@
+"""
+Data version counters shared by every worker process, stored in the
+data_version table (database/schema.sql).
+
+invalidate() / invalidate_all() (app/core/cache.py) bump the counters of
+the resources a committed write touched; the ETags of the read-heavy
+endpoints are built from them (app/core/etag.py). Since the counters live
+in the database, a write handled by one uvicorn worker changes the ETag
+that every other worker hands out.
+
+Two reserved rows:
+  "*"    bumped by invalidate_all(), i.e. writes that may touch everything
+  "@db"  a random id of the database itself, inserted by
+         database/schema.sql: after the database is recreated, validators
+         issued for the old one never match again.
+
+Reads never write: without the "@db" row (a database created before the
+table existed, run the statements at the end of schema.sql), current()
+returns None and responses go out without ETags.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from app.core.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+ALL_RESOURCES = "*"
+DB_ID = "@db"
+
+
+def bump(*names: str) -> None:
+    """
+    Add one to the counters of the given resources. Call after the write is
+    committed. Never raises: a failed bump is logged, and readers may then
+    revalidate against the old version until the next write.
+    """
+    try:
+        conn = get_db_connection()
+    except Exception as e:
+        logger.error("data version bump %s failed: %s", names, e)
+        return
+    cur = conn.cursor()
+    try:
+        for name in names:
+            cur.execute("UPDATE data_version SET version = version + 1 WHERE resource = %s", (name,))
+            if cur.rowcount == 0:
+                try:
+                    cur.execute("INSERT INTO data_version (resource, version) VALUES (%s, 1)", (name,))
+                except Exception:
+                    # another worker inserted the row first
+                    cur.execute("UPDATE data_version SET version = version + 1 WHERE resource = %s", (name,))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.error("data version bump %s failed: %s", names, e)
+    finally:
+        cur.close()
+        conn.close()
+
+
+def current(*names: str) -> Optional[Tuple[str, ...]]:
+    """
+    (database id, global version, name1 version, ...) for the given
+    resources, or None when the counters cannot be read (e.g. a database
+    without the data_version table or its "@db" row): callers then skip
+    conditional responses instead of guessing.
+    """
+    keys = (DB_ID, ALL_RESOURCES) + names
+    try:
+        conn = get_db_connection()
+    except Exception as e:
+        logger.warning("data versions unavailable: %s", e)
+        return None
+    cur = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(keys))
+        cur.execute(f"SELECT resource, version FROM data_version WHERE resource IN ({placeholders})", keys)
+        versions = {row[0]: row[1] for row in cur.fetchall()}
+    except Exception as e:
+        logger.warning("data versions unavailable: %s", e)
+        return None
+    finally:
+        cur.close()
+        conn.close()
+    if DB_ID not in versions:
+        logger.warning("data_version has no %r row, ETags are disabled", DB_ID)
+        return None
+    return tuple(str(versions.get(k, 0)) for k in keys)
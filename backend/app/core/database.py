@@ -7,7 +7,14 @@ def get_db_connection():
     """
     Creates and returns a new database connection.
     Automatically pulls credentials from settings.py
+
+    With DB_BACKEND=sqlite an embedded SQLite database is used instead of
+    MySQL (see app/core/sqlite_backend.py).
     """
+    if settings.DB_BACKEND == "sqlite":
+        from app.core.sqlite_backend import get_sqlite_connection
+        return get_sqlite_connection()
+
     try:
         connection = mysql.connector.connect(
             host=settings.DB_HOST,
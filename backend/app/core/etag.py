@@ -0,0 +1,62 @@
+"""
+ETag / If-None-Match helpers for conditional GETs.
+
+Versioned resources get an ETag derived from the data version counters
+shared by all workers (app/core/data_version.py, one small query), so an
+unchanged resource is answered with 304 Not Modified before the queries
+that build it run. The ETag includes the database id: validators issued
+for a recreated database never match.
+
+When the counters cannot be read, etag_for() returns None and the
+response is served without a validator.
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core import data_version
+
+# clients may reuse a stored copy but must revalidate it every time
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# saved assignment runs never change; deletion is only seen after a day
+RUN_CACHE_CONTROL = "private, max-age=86400"
+
+
+def etag_for(*resources: str, key: Optional[str] = None) -> Optional[str]:
+    """
+    ETag for a response built from the given resources; `key` tells apart
+    the items of one resource (e.g. a run id).
+    Compute it BEFORE reading the data: a write racing with the read then
+    only makes the next request miss, it can never produce a stale 304.
+    """
+    versions = data_version.current(*resources)
+    if versions is None:
+        return None
+    prefix = f"{key}-" if key is not None else ""
+    return f'"{prefix}' + ".".join(versions) + '"'
+
+
+def is_not_modified(request: Request, etag: Optional[str]) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_etag(response: Response, etag: Optional[str], cache_control: Optional[str] = REVALIDATE_CACHE_CONTROL) -> None:
+    if etag is None:
+        return
+    response.headers["ETag"] = etag
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
@@ -0,0 +1,282 @@
+"""
+Embedded SQLite backend used as a local stand-in for MySQL.
+
+Selected with DB_BACKEND=sqlite. The database is created from
+database/schema.sql (translated to SQLite on the fly) the first time a
+connection is requested, and optionally filled from database/seed.sql.
+
+The connection/cursor wrappers only implement the subset of the
+mysql-connector API the services actually use:
+  conn.cursor(dictionary=True), conn.commit(), conn.rollback(), conn.close(),
+  `with get_db_connection() as conn:`,
+  cursor.execute(), fetchone(), fetchall(), lastrowid, rowcount, close()
+"""
+
+import random
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import settings
+
+DATABASE_DIR = Path(__file__).resolve().parents[3] / "database"
+SCHEMA_PATH = DATABASE_DIR / "schema.sql"
+SEED_PATH = DATABASE_DIR / "seed.sql"
+
+_MEMORY_URI = "file:ta_assignment_system?mode=memory&cache=shared"
+
+_init_lock = threading.Lock()
+_initialized = False
+# Shared in-memory databases disappear with their last connection,
+# so one connection is kept open for the lifetime of the process.
+_anchor: Optional[sqlite3.Connection] = None
+
+
+# ----------------------------
+# Dialect translation
+# ----------------------------
+_STRING_LITERAL = re.compile(r"('(?:[^'\\]|\\.|'')*')")
+
+_GROUP_CONCAT = re.compile(
+    r"GROUP_CONCAT\(\s*(DISTINCT\s+)?(.+?)"
+    r"(\s+ORDER\s+BY\s+[^)]+?(\s+DESC)?)?"
+    r"(?:\s+SEPARATOR\s+('[^']*'))?\s*\)",
+    re.IGNORECASE | re.DOTALL,
+)
+_TIMESTAMPDIFF = re.compile(r"TIMESTAMPDIFF\(\s*(\w+)\s*,", re.IGNORECASE)
+_INSERT_IGNORE = re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE)
+_ON_DUPLICATE = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE)
+_VALUES_FN = re.compile(r"\bVALUES\(\s*(\w+)\s*\)", re.IGNORECASE)
+_TRUNCATE = re.compile(r"\bTRUNCATE\s+TABLE\b", re.IGNORECASE)
+_FOR_UPDATE = re.compile(r"\bFOR\s+UPDATE\b", re.IGNORECASE)
+_NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+
+
+def _translate_group_concat(m: re.Match) -> str:
+    distinct, expr, ordered, desc, sep = m.groups()
+    order = 0 if not ordered else (-1 if desc else 1)
+    return (
+        f"mysql_group_concat({expr.strip()}, {sep or repr(',')}, "
+        f"{1 if distinct else 0}, {order})"
+    )
+
+
+def _translate_fragment(sql: str) -> str:
+    """Translate a piece of SQL that contains no string literals."""
+    sql = _INSERT_IGNORE.sub("INSERT OR IGNORE", sql)
+    sql = _TRUNCATE.sub("DELETE FROM", sql)
+    sql = _FOR_UPDATE.sub("", sql)
+    sql = _TIMESTAMPDIFF.sub(lambda m: f"TIMESTAMPDIFF('{m.group(1).upper()}',", sql)
+
+    dup = _ON_DUPLICATE.search(sql)
+    if dup:
+        head, tail = sql[:dup.start()], sql[dup.end():]
+        sql = head + "ON CONFLICT DO UPDATE SET" + _VALUES_FN.sub(r"excluded.\1", tail)
+
+    sql = _NAMED_PARAM.sub(r":\1", sql)
+    return sql.replace("%s", "?")
+
+
+def translate_sql(sql: str) -> str:
+    """
+    Rewrite a MySQL statement as used by the services into SQLite:
+      - %s / %(name)s placeholders  -> ? / :name
+      - INSERT IGNORE               -> INSERT OR IGNORE
+      - ON DUPLICATE KEY UPDATE c = VALUES(c)
+                                    -> ON CONFLICT DO UPDATE SET c = excluded.c
+      - GROUP_CONCAT(DISTINCT x ORDER BY x SEPARATOR ', ')
+                                    -> mysql_group_concat(x, ', ', 1, 1)
+      - TIMESTAMPDIFF(MINUTE, ...)  -> TIMESTAMPDIFF('MINUTE', ...)
+      - TRUNCATE TABLE t            -> DELETE FROM t
+      - SELECT ... FOR UPDATE       -> SELECT ...
+    String literals are left untouched.
+    """
+    sql = _GROUP_CONCAT.sub(_translate_group_concat, sql)
+    parts = _STRING_LITERAL.split(sql)
+    # split() with a capturing group puts literals at odd indexes
+    return "".join(p if i % 2 else _translate_fragment(p) for i, p in enumerate(parts))
+
+
+def translate_schema(script: str) -> str:
+    """Translate database/schema.sql (MySQL DDL) into SQLite DDL."""
+    script = re.sub(r"^\s*(CREATE\s+DATABASE|USE)\b[^;]*;", "", script, flags=re.IGNORECASE | re.MULTILINE)
+    script = re.sub(
+        r"\bINT\s+(?:AUTO_INCREMENT\s+PRIMARY\s+KEY|PRIMARY\s+KEY\s+AUTO_INCREMENT)(?:\s+UNIQUE)?",
+        "INTEGER PRIMARY KEY AUTOINCREMENT",
+        script,
+        flags=re.IGNORECASE,
+    )
+    script = re.sub(r"\bENUM\s*\([^)]*\)", "TEXT", script, flags=re.IGNORECASE)
+    return script
+
+
+# ----------------------------
+# MySQL functions missing in SQLite
+# ----------------------------
+class _GroupConcat:
+    def __init__(self):
+        self.values = []
+        self.sep = ","
+        self.distinct = False
+        self.order = 0
+
+    def step(self, value, sep, distinct, order):
+        self.sep, self.distinct, self.order = sep, bool(distinct), order
+        if value is None:
+            return
+        if self.distinct and value in self.values:
+            return
+        self.values.append(value)
+
+    def finalize(self):
+        if not self.values:
+            return None
+        values = self.values
+        if self.order:
+            values = sorted(values, reverse=self.order < 0)
+        return self.sep.join(str(v) for v in values)
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _now() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+
+_UNIT_SECONDS = {"SECOND": 1, "MINUTE": 60, "HOUR": 3600, "DAY": 86400, "WEEK": 604800}
+
+
+def _timestampdiff(unit: str, start: Any, end: Any) -> Optional[int]:
+    a, b = _parse_datetime(start), _parse_datetime(end)
+    if a is None or b is None:
+        return None
+    return int((b - a).total_seconds() // _UNIT_SECONDS[unit])
+
+
+sqlite3.register_adapter(datetime, lambda d: d.strftime("%Y-%m-%d %H:%M:%S"))
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.fromisoformat(b.decode()))
+
+
+# ----------------------------
+# mysql-connector compatible wrappers
+# ----------------------------
+class SQLiteCursor:
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {d[0]: v for d, v in zip(self._cursor.description, row)}
+
+    def execute(self, query: str, params: Any = None):
+        self._cursor.execute(translate_sql(query), params if params is not None else ())
+        return None
+
+    def executemany(self, query: str, seq_params):
+        self._cursor.executemany(translate_sql(query), seq_params)
+        return None
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def cursor(self, dictionary: bool = False, **kwargs) -> SQLiteCursor:
+        return SQLiteCursor(self._conn.cursor(), dictionary=dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def is_connected(self) -> bool:
+        return True
+
+    def close(self):
+        self._conn.close()
+
+    # Same semantics as mysql-connector: leaving the block closes the
+    # connection, uncommitted work is discarded.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _connect_raw() -> sqlite3.Connection:
+    path = settings.SQLITE_PATH
+    if path == ":memory:":
+        conn = sqlite3.connect(
+            _MEMORY_URI, uri=True, check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.create_function("NOW", 0, _now)
+    conn.create_function("RAND", 0, random.random)
+    conn.create_function("TIMESTAMPDIFF", 3, _timestampdiff)
+    conn.create_aggregate("mysql_group_concat", 4, _GroupConcat)
+    return conn
+
+
+def _ensure_initialized():
+    global _initialized, _anchor
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        conn = _connect_raw()
+        has_schema = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='weights'"
+        ).fetchone()
+        if not has_schema:
+            conn.executescript(translate_sql(translate_schema(SCHEMA_PATH.read_text(encoding="utf-8"))))
+            if settings.SQLITE_SEED:
+                seed = translate_schema(SEED_PATH.read_text(encoding="utf-8"))
+                conn.executescript(translate_sql(seed))
+            conn.commit()
+
+        if settings.SQLITE_PATH == ":memory:":
+            _anchor = conn
+        else:
+            conn.close()
+        _initialized = True
+
+
+def get_sqlite_connection() -> SQLiteConnection:
+    _ensure_initialized()
+    return SQLiteConnection(_connect_raw())
@@ -21,6 +21,7 @@ from app.routes import register_finish
 from app.routes import users
 from app.routes.assignment_history import router as assignment_history_router
 from app.routes import import_excel
+from app.routes import cache_stats
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI()
@@ -56,6 +57,7 @@ app.include_router(checkers.router, prefix="/api/checkers", tags=["checkers"])
 app.include_router(register_finish.router)
 app.include_router(import_excel.router)
 app.include_router(users.router, prefix="/api")
+app.include_router(cache_stats.router, prefix="/api", tags=["Cache"])
 
 
 
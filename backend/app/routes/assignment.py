@@ -1,4 +1,5 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, File, UploadFile, HTTPException, Request, Response
+from app.core.etag import etag_for, is_not_modified, not_modified, set_etag
 from app.services.assignmentAlgorithm import run_assignment_algorithm, updateDB
 from app.services.assignment_excel import generate_ta_assignments
 from app.services.assignment_service import get_saved_assignments, override_assignment
@@ -67,15 +68,22 @@ async def run_assignment_excel(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
     
 @router.get("/get-assignments")
-def fetch_assignments():
+def fetch_assignments(request: Request, response: Response):
     """
     Returns:
     - assignments by course
     - workloads computed as number of assigned courses
+
+    Supports If-None-Match: answers 304 without querying the DB when
+    neither assignments nor TA/professor/course data changed.
     """
+    etag = etag_for("assignments", "tas", "professors", "courses")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
 
     try:
         result = get_saved_assignments()
+        set_etag(response, etag)
         return result
 
     except Exception as e:
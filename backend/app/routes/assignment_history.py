@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Optional
 from app.services.assignment_history_services import (
     save_assignment_run_from_db,
@@ -8,6 +8,7 @@ from app.services.assignment_history_services import (
     delete_assignment_run
 )
 from app.services.activity_log_service import add_log
+from app.core.etag import RUN_CACHE_CONTROL, etag_for, is_not_modified, not_modified, set_etag
 import traceback
 
 router = APIRouter()
@@ -28,11 +29,17 @@ def fetch_runs(limit: int = 50):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/assignment-runs/{run_id}")
-def fetch_run(run_id: int):
+def fetch_run(run_id: int, request: Request, response: Response):
+    # saving or deleting any run bumps "assignment_runs": a matching tag
+    # proves this run is unchanged, without loading it
+    etag = etag_for("assignment_runs", key=f"run-{run_id}")
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control=RUN_CACHE_CONTROL)
     try:
         data = get_assignment_run(run_id)
         if not data:
             raise HTTPException(status_code=404, detail="Run not found")
+        set_etag(response, etag, cache_control=RUN_CACHE_CONTROL)
         return data
     except HTTPException:
         raise
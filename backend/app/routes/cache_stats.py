@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from app.core.cache import cache_stats
+
+router = APIRouter()
+
+@router.get("/cache/stats")
+def fetch_cache_stats():
+    """
+    Hit/miss counters, size and TTL of each reference-data cache in this worker.
+    """
+    return cache_stats()
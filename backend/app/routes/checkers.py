@@ -1,34 +1,325 @@
+import asyncio
+import hashlib
+import json
 import os
-import tempfile
+import re
+import zipfile
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import Response, StreamingResponse
 
-from app.services.signaturechecker import run_signature_checker
-from app.services.internship_report_checker import run_internship_checker
+from app.core.cache import get_cache
+from app.core.checker_pool import (
+    busy_error,
+    iterate_in_pool,
+    pool_stats,
+    release_slots,
+    reserve_slots,
+    run_checker_job,
+    run_reserved_job,
+)
+from app.core.config import settings
+from app.services import checker_engine, internship_report_checker, signaturechecker
 
 router = APIRouter()
 
-def _save_upload_to_temp_pdf(upload: UploadFile) -> str:
+# kind -> (checker function, checker version)
+CHECKERS: Dict[str, Tuple[Callable[..., Dict[str, Any]], str]] = {
+    "comp590": (signaturechecker.run_signature_checker, signaturechecker.CHECKER_VERSION),
+    "comp291-391": (internship_report_checker.run_internship_checker, internship_report_checker.CHECKER_VERSION),
+}
+
+# kind -> profile, for the streaming and debug endpoints
+PROFILES = {
+    "comp590": signaturechecker.PROFILE,
+    "comp291-391": internship_report_checker.PROFILE,
+}
+
+MAX_PDF_BYTES = int(settings.CHECKER_MAX_UPLOAD_MB * 1024 * 1024)
+READ_CHUNK_BYTES = 1024 * 1024
+MAX_BATCH_FILES = 500
+BATCH_TRUNCATED_ERROR = (
+    f"Batch limit of {MAX_BATCH_FILES} PDFs reached: this file and the ones after it were not checked."
+)
+
+# Reports keyed by (kind, checker version, sha256 of the PDF, params):
+# re-submitting the same file returns immediately.
+_results = get_cache(
+    "checker_results",
+    ttl=settings.CHECKER_RESULT_CACHE_TTL,
+    maxsize=settings.CHECKER_RESULT_CACHE_SIZE,
+)
+
+
+class TooLarge(Exception):
+    pass
+
+
+def _read_limited(f: IO[bytes]) -> Tuple[bytes, str]:
+    """Read a binary stream in chunks, up to MAX_PDF_BYTES. Returns (data, sha256 hex)."""
+    digest = hashlib.sha256()
+    chunks: List[bytes] = []
+    size = 0
+    while True:
+        chunk = f.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > MAX_PDF_BYTES:
+            raise TooLarge()
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
+async def _read_upload_pdf(upload: UploadFile) -> Tuple[bytes, str]:
     # UploadFile.content_type is sometimes missing; don't be too strict
     filename = upload.filename or "upload.pdf"
     if not filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Please upload a PDF file.")
+    try:
+        # the spooled upload may be on disk: blocking reads
+        return await asyncio.to_thread(_read_limited, upload.file)
+    except TooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"PDF is larger than {settings.CHECKER_MAX_UPLOAD_MB:g} MB.",
+        )
 
-    tmpdir = tempfile.mkdtemp(prefix="pdf_")
-    pdf_path = os.path.join(tmpdir, filename)
 
-    with open(pdf_path, "wb") as f:
-        f.write(upload.file.read())
+async def _check(
+    kind: str,
+    data: bytes,
+    sha256: str,
+    filename: str,
+    run: Callable[..., Any] = run_checker_job,
+    **params,
+) -> Dict[str, Any]:
+    """Run a checker on in-memory PDF bytes, going through the result cache."""
+    checker, version = CHECKERS[kind]
+    key = (kind, version, sha256, tuple(sorted(params.items())))
+    use_cache = _results.ttl > 0
 
-    return pdf_path
+    if use_cache:
+        report = _results.get(key, None)
+        if report is not None:
+            # same content may arrive under another name
+            return {**report, "file": os.path.basename(filename)}
+
+    generation = _results.generation
+    report = await run(checker, data, filename=filename, **params)
+    if use_cache:
+        _results.set(key, report, generation=generation)
+    return report
 
 
 @router.post("/comp590")
 async def check_comp590(file: UploadFile = File(...)):
-    pdf_path = _save_upload_to_temp_pdf(file)
-    return run_signature_checker(pdf_path, debug=False)
+    data, sha256 = await _read_upload_pdf(file)
+    return await _check("comp590", data, sha256, file.filename or "upload.pdf")
 
 
 @router.post("/comp291-391")
-async def check_comp291_391(file: UploadFile = File(...)):
-    pdf_path = _save_upload_to_temp_pdf(file)
-    return run_internship_checker(pdf_path, debug=False)
\ No newline at end of file
+async def check_comp291_391(file: UploadFile = File(...), stop_at_first_found: bool = False):
+    data, sha256 = await _read_upload_pdf(file)
+    return await _check(
+        "comp291-391", data, sha256, file.filename or "upload.pdf",
+        stop_at_first_found=stop_at_first_found,
+    )
+
+
+def _iter_batch_entries(uploads: List[UploadFile]) -> Iterator[Tuple[str, Any, Optional[str]]]:
+    """
+    Yield (name, pdf_bytes, sha256) for every PDF in the uploads,
+    or (name, error_message, None). Past MAX_BATCH_FILES PDFs, the first
+    one left out gets BATCH_TRUNCATED_ERROR and the rest are not read.
+    ZIP archives are read member by member from the upload stream; nothing is
+    extracted to disk and only one member is held in memory at a time.
+    """
+    count = 0
+    for upload in uploads:
+        name = upload.filename or "upload.pdf"
+        lower = name.lower()
+
+        if lower.endswith(".zip"):
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile:
+                yield name, "Not a valid ZIP archive.", None
+                continue
+            with archive:
+                for info in archive.infolist():
+                    member = info.filename
+                    if info.is_dir() or not member.lower().endswith(".pdf"):
+                        continue
+                    if member.startswith("__MACOSX/") or os.path.basename(member).startswith("._"):
+                        continue
+                    count += 1
+                    if count > MAX_BATCH_FILES:
+                        yield member, BATCH_TRUNCATED_ERROR, None
+                        return
+                    try:
+                        # the size in the ZIP header is not trusted, reads are capped
+                        with archive.open(info) as f:
+                            data, sha256 = _read_limited(f)
+                    except TooLarge:
+                        yield member, "File too large.", None
+                        continue
+                    except (zipfile.BadZipFile, NotImplementedError, RuntimeError):
+                        yield member, "Could not read this ZIP entry.", None
+                        continue
+                    yield member, data, sha256
+        elif lower.endswith(".pdf"):
+            count += 1
+            if count > MAX_BATCH_FILES:
+                yield name, BATCH_TRUNCATED_ERROR, None
+                return
+            try:
+                data, sha256 = _read_limited(upload.file)
+            except TooLarge:
+                yield name, "File too large.", None
+                continue
+            yield name, data, sha256
+        else:
+            yield name, "Please upload PDF or ZIP files.", None
+
+
+@router.post("/{kind}/batch")
+async def check_batch(kind: str, files: List[UploadFile] = File(...)):
+    """
+    Check many PDFs in one request: several PDF files and/or ZIP archives of PDFs.
+
+    The response is NDJSON (one JSON object per line), streamed as results
+    finish, so lines come back in completion order, not upload order:
+      {"index": 0, "file": "a.pdf", "ok": true, "report": {...}}
+      {"index": 1, "file": "b.pdf", "ok": false, "error": "..."}
+    The last line is {"done": true, "total": N, "failed": M, "truncated": false};
+    "truncated" is true when the upload held more than MAX_BATCH_FILES PDFs.
+    """
+    if kind not in CHECKERS:
+        raise HTTPException(status_code=404, detail=f"Unknown checker '{kind}'.")
+
+    # One slot per worker is enough to keep every core busy
+    slots = reserve_slots(max(1, settings.CHECKER_WORKERS))
+    if not slots:
+        raise busy_error()
+
+    async def run_one(index: int, name: str, data: Any, sha256: Optional[str]) -> Dict[str, Any]:
+        line: Dict[str, Any] = {"index": index, "file": name}
+        if sha256 is None:
+            line.update(ok=False, error=data)
+            return line
+        try:
+            report = await _check(kind, data, sha256, name, run=run_reserved_job)
+            line.update(ok=True, report=report)
+        except HTTPException as e:
+            line.update(ok=False, error=e.detail)
+        except Exception as e:
+            print(f"Batch check failed for {name}: {e}")
+            line.update(ok=False, error="Could not check this PDF.")
+        return line
+
+    async def results():
+        total = failed = 0
+        truncated = False
+        entries = _iter_batch_entries(files)
+        running = set()
+        exhausted = False
+        try:
+            while True:
+                # keep at most `slots` jobs in flight; read the next entries lazily
+                while not exhausted and len(running) < slots:
+                    # reading/inflating a member is blocking file I/O
+                    entry = await asyncio.to_thread(next, entries, None)
+                    if entry is None:
+                        exhausted = True
+                        break
+                    running.add(asyncio.ensure_future(run_one(total, *entry)))
+                    total += 1
+                if not running:
+                    break
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    line = task.result()
+                    if not line["ok"]:
+                        failed += 1
+                        truncated |= line["error"] == BATCH_TRUNCATED_ERROR
+                    yield json.dumps(line) + "\n"
+            yield json.dumps({"done": True, "total": total, "failed": failed, "truncated": truncated}) + "\n"
+        finally:
+            for task in running:
+                task.cancel()
+            release_slots(slots)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.post("/{kind}/stream")
+async def check_stream(kind: str, file: UploadFile = File(...), stop_at_first_found: bool = False):
+    """
+    Check one (long) PDF and stream the report as NDJSON while pages finish:
+      {"event": "start", "checker": "comp590", "page_count": 200, "mode": "...", ...}
+      {"event": "page", "page": 1, "page_status": "NOT_FOUND", ...}   one line per page
+      {"event": "done", "overall_status": "FOUND", "timings_ms": {...}, ...}
+    Clients can show progress and disconnect early, which stops the check.
+    Failures, and checks running past CHECKER_JOB_TIMEOUT, end the stream with
+    {"event": "error", "error": "..."}.
+    Streamed results are not cached.
+    """
+    if kind not in PROFILES:
+        raise HTTPException(status_code=404, detail=f"Unknown checker '{kind}'.")
+
+    data, _ = await _read_upload_pdf(file)
+    filename = file.filename or "upload.pdf"
+    if not reserve_slots(1):
+        raise busy_error()
+
+    async def events():
+        try:
+            async for event in iterate_in_pool(
+                checker_engine.iter_checker, PROFILES[kind], data,
+                filename=filename, stop_at_first_found=stop_at_first_found,
+            ):
+                yield json.dumps(event) + "\n"
+        except HTTPException as e:
+            yield json.dumps({"event": "error", "error": e.detail}) + "\n"
+        except Exception as e:
+            print(f"Streaming check failed for {filename}: {e}")
+            yield json.dumps({"event": "error", "error": "Could not check this PDF."}) + "\n"
+        finally:
+            release_slots(1)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.post("/{kind}/debug")
+async def check_debug(kind: str, file: UploadFile = File(...), stop_at_first_found: bool = False):
+    """
+    Check one PDF with debug output, downloaded as a ZIP: report.json plus
+    the cleaned mask of every analyzed ROI / fallback page (PNG), at most
+    CHECKER_DEBUG_MAX_MASKS of them. Built in memory by the checker worker;
+    not cached.
+    """
+    if kind not in PROFILES:
+        raise HTTPException(status_code=404, detail=f"Unknown checker '{kind}'.")
+
+    data, _ = await _read_upload_pdf(file)
+    filename = file.filename or "upload.pdf"
+    bundle = await run_checker_job(
+        checker_engine.run_checker_debug_bundle, PROFILES[kind], data,
+        filename=filename, stop_at_first_found=stop_at_first_found,
+        max_masks=max(0, settings.CHECKER_DEBUG_MAX_MASKS),
+    )
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.splitext(os.path.basename(filename))[0]) or "upload"
+    return Response(
+        content=bundle,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{stem}_debug.zip"'},
+    )
+
+
+@router.get("/stats")
+def checker_pool_stats():
+    """Load of the checker process pool in this worker."""
+    return pool_stats()
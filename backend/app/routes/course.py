@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Request, Response
 from typing import List
 from app.models import Course, CourseCreate, CourseDetails
 from app.services.course_services import get_courses, get_courses_by_professor_username, CourseUpdate, update_course_in_db, create_course_with_professor, remove_course_from_professor_and_delete_if_orphan, get_course_details, get_courses_by_ta_username
 from app.services.activity_log_service import add_log
 from app.core.database import get_db_connection
+from app.core.etag import etag_for, is_not_modified, not_modified, set_etag
 
 router = APIRouter()
 
 @router.get("/", response_model=list[Course])
-def read_courses():
-    return get_courses()
+def read_courses(request: Request, response: Response):
+    etag = etag_for("courses")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    courses = get_courses()
+    set_etag(response, etag)
+    return courses
 
 
 @router.get("/by-professor", response_model=List[Course])
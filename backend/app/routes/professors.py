@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException
-from app.services.professors_services import get_all_professors
+from fastapi import APIRouter, HTTPException, Query
+from app.services.professors_services import get_all_professors, get_professors_page
 from pydantic import BaseModel
 from typing import List, Optional
 from app.services.professors_services import get_professor_by_id, update_professor
@@ -13,11 +13,20 @@ class ProfessorUpdateModel(BaseModel):
 router = APIRouter()
 
 @router.get("/professors")
-def fetch_all_professors():
+def fetch_all_professors(
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (enables pagination)"),
+    after_name: Optional[str] = Query(None, description="Name of the last professor on the previous page"),
+    after_id: Optional[int] = Query(None, description="ID of the last professor on the previous page"),
+):
     """
     Return all professors from the database.
+    With `limit`, returns one keyset page plus the cursor for the next one.
     """
+    if (after_name is None) != (after_id is None):
+        raise HTTPException(status_code=400, detail="after_name and after_id must be given together")
     try:
+        if limit is not None:
+            return get_professors_page(limit, after_name=after_name, after_id=after_id)
         professors = get_all_professors()
         return professors
     except Exception as e:
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 
 from app.services.ta_services import get_all_tas, get_ta_by_id, update_ta
+from app.core.etag import etag_for, is_not_modified, not_modified, set_etag
 
 router = APIRouter()
 
@@ -14,9 +15,14 @@ class TAUpdateModel(BaseModel):
     preferred_professor_ids: List[int] = []          # [1,5,9]
 
 @router.get("/tas")
-def fetch_all_tas():
+def fetch_all_tas(request: Request, response: Response):
+    etag = etag_for("tas")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
     try:
-        return get_all_tas()
+        tas = get_all_tas()
+        set_etag(response, etag)
+        return tas
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -12,6 +12,7 @@
 from typing import Dict, List, Any, Tuple, Optional
 
 from app.core.database import get_db_connection
+from app.core.cache import invalidate
 from .ta_services import get_all_tas
 from .professors_services import get_all_professors
 from .weight_services import get_weights
@@ -258,7 +259,7 @@ def run_assignment_algorithm(max_same_prof: int = 2):
         })
 
     # ---- Load professors (name -> preferred TA names) ----
-    profs_db = get_all_professors()
+    profs_db = get_all_professors(include_ta_details=False)
     prof_pref_map: Dict[str, List[str]] = {}
     for p in (profs_db or []):
         prof_pref_map[p["name"]] = [ta["name"] for ta in (p.get("preferred_tas") or [])]
@@ -525,6 +526,7 @@ def updateDB(assignments: Dict[str, Any]):
                     )
 
         conn.commit()
+        invalidate("assignments")
         print("All assignments successfully updated in the database.")
         if skipped_duplicates:
             print(f"[INFO] Skipped {skipped_duplicates} duplicate assignment entries.")
@@ -1,5 +1,6 @@
 from typing import Optional, Dict, Any
 from app.core.database import get_db_connection
+from app.core.cache import invalidate
 
 def save_assignment_run_from_db(created_by: Optional[str] = None, notes: Optional[str] = None) -> int:
     """
@@ -67,6 +68,7 @@ def save_assignment_run_from_db(created_by: Optional[str] = None, notes: Optiona
             """, (run_id, r["course_code"], r["ta_id"], r["ta_name"]))
 
         conn.commit()
+        invalidate("assignment_runs")
         return run_id
 
     except Exception:
@@ -178,6 +180,7 @@ def apply_run(run_id: int):
             )
 
         conn.commit()
+        invalidate("assignments")
         return {"ok": True, "run_id": run_id, "inserted_pairs": len(items)}
     except:
         conn.rollback()
@@ -193,6 +196,7 @@ def delete_assignment_run(run_id: int) -> bool:
     try:
         cur.execute("DELETE FROM assignment_run WHERE run_id = %s", (run_id,))
         conn.commit()
+        invalidate("assignment_runs")
         return cur.rowcount > 0
     except:
         conn.rollback()
@@ -216,6 +220,7 @@ def save_run_items_from_active(run_id: int) -> int:
                 (run_id, r["course_id"], r["ta_id"])
             )
         conn.commit()
+        invalidate("assignment_runs")
         return len(rows)
     except:
         conn.rollback()
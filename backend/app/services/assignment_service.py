@@ -1,6 +1,7 @@
 # app/services/assignment_services.py
 from fastapi import HTTPException
 from app.core.database import get_db_connection
+from app.core.cache import invalidate
 from app.services.activity_log_service import add_log
 from typing import Dict, Any
 
@@ -121,11 +122,10 @@ def override_assignment(payload: dict):
     # Remove selected TAs
     for ta_name in remove_tas:
         cursor.execute("""
-            DELETE ta_assignment
-            FROM ta_assignment
-            JOIN ta ON ta.ta_id = ta_assignment.ta_id
-            WHERE ta.name = %s AND ta_assignment.course_id = %s
-        """, (ta_name, course_id))
+            DELETE FROM ta_assignment
+            WHERE course_id = %s
+              AND ta_id IN (SELECT ta_id FROM ta WHERE name = %s)
+        """, (course_id, ta_name))
 
     # Add selected TAs
     for ta_name in add_tas:
@@ -142,6 +142,7 @@ def override_assignment(payload: dict):
     conn.commit()
     cursor.close()
     conn.close()
+    invalidate("assignments")
 
     # Log the override event
     added = ", ".join(add_tas) if add_tas else "none"
@@ -0,0 +1,550 @@
+# backend/app/services/checker_common.py
+#
+# Helpers shared by the PDF signature checkers
+# (checker_engine.py and the checker profiles built on it).
+
+import ctypes
+import functools
+import math
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+# A PDF given either as a file path or as its raw bytes (uploads are kept in memory)
+PdfSource = Union[str, bytes]
+
+
+def source_name(source: PdfSource, filename: Optional[str] = None) -> str:
+    """File name reported for a checked PDF."""
+    if filename:
+        return os.path.basename(filename)
+    if isinstance(source, str):
+        return os.path.basename(source)
+    return "upload.pdf"
+
+# The detection thresholds (areas, kernel and block sizes) were tuned on
+# renders at this DPI; at other DPIs they are scaled by dpi_factor().
+REFERENCE_DPI = 220
+
+
+def dpi_factor(dpi: float) -> float:
+    """Linear size factor of a render at `dpi` relative to REFERENCE_DPI."""
+    return dpi / float(REFERENCE_DPI)
+
+
+def scaled_odd(n: int, factor: float, minimum: int = 3) -> int:
+    """Scale an odd kernel/block size, keeping it odd and >= minimum."""
+    v = max(minimum, int(round(n * factor)))
+    return v if v % 2 else v + 1
+
+
+def scale_box(box: Tuple[int, int, int, int], factor: float) -> Tuple[int, int, int, int]:
+    """Scale an (x,y,w,h) pixel box to another DPI, rounding outwards."""
+    x, y, w, h = box
+    x1, y1 = int(math.floor(x * factor)), int(math.floor(y * factor))
+    x2, y2 = int(math.ceil((x + w) * factor)), int(math.ceil((y + h) * factor))
+    return x1, y1, max(1, x2 - x1), max(1, y2 - y1)
+
+
+def unscale_box(box: Tuple[int, int, int, int], factor: float) -> Tuple[int, int, int, int]:
+    """Inverse of scale_box for reporting: coarse pixel box -> reference pixel box."""
+    x, y, w, h = box
+    return (int(round(x / factor)), int(round(y / factor)),
+            max(1, int(round(w / factor))), max(1, int(round(h / factor))))
+
+
+def clamp_box(box: Tuple[int, int, int, int], page_w: int, page_h: int) -> Tuple[int, int, int, int]:
+    x, y, w, h = box
+    x = max(0, min(page_w - 1, x))
+    y = max(0, min(page_h - 1, y))
+    return x, y, max(1, min(page_w - x, w)), max(1, min(page_h - y, h))
+
+
+def pdf_box_to_pixel_box(box_pdf, page_h_pts, scale):
+    """PDF box (l,b,r,t) points -> pixel box (x,y,w,h) top-left origin."""
+    l, b, r, t = box_pdf
+    x1 = int(round(l * scale))
+    x2 = int(round(r * scale))
+    y1 = int(round((page_h_pts - t) * scale))
+    y2 = int(round((page_h_pts - b) * scale))
+    x = min(x1, x2)
+    y = min(y1, y2)
+    w = max(1, abs(x2 - x1))
+    h = max(1, abs(y2 - y1))
+    return x, y, w, h
+
+
+@functools.lru_cache(maxsize=128)
+def rect_kernel(w: int, h: int) -> np.ndarray:
+    """
+    Rectangular morphology kernel (cv2.getStructuringElement(MORPH_RECT, (w, h))),
+    cached: the same few sizes are needed for every ROI and page. Read-only.
+    """
+    k = cv2.getStructuringElement(cv2.MORPH_RECT, (w, h))
+    k.setflags(write=False)
+    return k
+
+
+def component_candidates(
+    mask: np.ndarray,
+    max_keep: int,
+    min_area: float,
+    max_area: float,
+    max_fill: float = 0.75,
+    score_scale: float = 1.0,
+) -> List[Tuple[float, int, int, int, int]]:
+    """
+    Connected components of a binary mask that look like pen strokes.
+    Returns up to `max_keep` candidates (score, x, y, w, h), best first.
+
+    Keeps components with min_area <= area <= max_area whose fill ratio
+    (area / bbox area) is at most `max_fill` (no solid blocks). The score,
+    area * fill / score_scale, favors larger, moderately sparse blobs.
+
+    Filtering runs as NumPy operations over the stats array and the top-k
+    uses argpartition, so full pages with tens of thousands of text specks
+    never go through a Python loop. Ties keep component order.
+    """
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    return candidates_from_stats(stats[1:], max_keep, min_area, max_area, max_fill, score_scale)
+
+
+def candidates_from_stats(
+    stats: np.ndarray,
+    max_keep: int,
+    min_area: float,
+    max_area: float,
+    max_fill: float = 0.75,
+    score_scale: float = 1.0,
+) -> List[Tuple[float, int, int, int, int]]:
+    """Filtering/top-k stage of component_candidates over a connectedComponentsWithStats
+    stats array without the background row."""
+    if not len(stats) or max_keep <= 0:
+        return []
+
+    w = stats[:, cv2.CC_STAT_WIDTH].astype(np.int64)
+    h = stats[:, cv2.CC_STAT_HEIGHT].astype(np.int64)
+    area = stats[:, cv2.CC_STAT_AREA].astype(np.float64)
+    bbox_area = w * h
+
+    ok = (bbox_area > 0) & (area >= min_area) & (area <= max_area)
+    idx = np.flatnonzero(ok)
+    if not len(idx):
+        return []
+    fill = area[idx] / bbox_area[idx]
+    keep = fill <= max_fill
+    idx, fill = idx[keep], fill[keep]
+    if not len(idx):
+        return []
+    scores = area[idx] * fill / score_scale
+
+    sel = np.arange(len(idx))
+    if len(idx) > max_keep:
+        part = np.argpartition(-scores, max_keep - 1)[:max_keep]
+        kth = scores[part].min()
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:max_keep - len(above)]
+        sel = np.concatenate([above, ties])
+    # best first; equal scores in component order (like a stable sort)
+    sel = sel[np.lexsort((sel, -scores[sel]))]
+
+    out: List[Tuple[float, int, int, int, int]] = []
+    for j in sel:
+        x, y, cw, ch = stats[idx[j], :4]
+        out.append((float(scores[j]), int(x), int(y), int(cw), int(ch)))
+    return out
+
+
+class RectGrid:
+    """
+    Uniform-grid spatial index over (x,y,w,h) pixel boxes (the text rects of
+    a page). Built once per page; a query only looks at the rects sharing a
+    grid cell with the query box instead of every rect on the page.
+    The cells are built on the first query, so pages that are never
+    queried cost nothing.
+    """
+
+    def __init__(self, rects: List[Tuple[int, int, int, int]], cell: int = 128):
+        self.cell = cell
+        self.rects = np.asarray(rects, dtype=np.int64).reshape(-1, 4)
+        self._cells: Optional[Dict[Tuple[int, int], List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def _build(self) -> Dict[Tuple[int, int], List[int]]:
+        c = self.cell
+        cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, (x, y, w, h) in enumerate(self.rects.tolist()):
+            for cx in range(x // c, (x + max(1, w) - 1) // c + 1):
+                for cy in range(y // c, (y + max(1, h) - 1) // c + 1):
+                    cells[(cx, cy)].append(i)
+        return cells
+
+    def nearby(self, box: Tuple[int, int, int, int]) -> np.ndarray:
+        """Indexes of rects sharing at least one grid cell with `box`."""
+        if self._cells is None:
+            self._cells = self._build()
+        x, y, w, h = box
+        c = self.cell
+        found = set()
+        for cx in range(x // c, (x + max(1, w) - 1) // c + 1):
+            for cy in range(y // c, (y + max(1, h) - 1) // c + 1):
+                found.update(self._cells.get((cx, cy), ()))
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def max_overlap_ratios(self, boxes: List[Tuple[int, int, int, int]]) -> np.ndarray:
+        """
+        For each box: the largest (intersection with one rect) / (box area)
+        over all rects, computed in one vectorized pass over the rects near
+        any of the boxes. Returns a float array of len(boxes).
+        """
+        out = np.zeros(len(boxes), dtype=np.float64)
+        if not boxes or not len(self.rects):
+            return out
+        idx = np.unique(np.concatenate([self.nearby(b) for b in boxes]))
+        if not len(idx):
+            return out
+
+        q = np.asarray(boxes, dtype=np.int64).reshape(-1, 4)
+        r = self.rects[idx]
+        # (N, 1) against (1, M)
+        qx1, qy1 = q[:, 0:1], q[:, 1:2]
+        qx2, qy2 = qx1 + q[:, 2:3], qy1 + q[:, 3:4]
+        rx1, ry1 = r[:, 0], r[:, 1]
+        rx2, ry2 = rx1 + r[:, 2], ry1 + r[:, 3]
+        iw = np.clip(np.minimum(qx2, rx2) - np.maximum(qx1, rx1), 0, None)
+        ih = np.clip(np.minimum(qy2, ry2) - np.maximum(qy1, ry1), 0, None)
+        inter = (iw * ih).max(axis=1)
+        area = q[:, 2] * q[:, 3]
+        np.divide(inter, area, out=out, where=area > 0)
+        return out
+
+    def max_overlap_ratio(self, box: Tuple[int, int, int, int]) -> float:
+        return float(self.max_overlap_ratios([box])[0])
+
+
+def build_text_index(page: pdfium.PdfPage, scale: float, keyword: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read the page's text layer ONCE and return every text rect with its text,
+    in both PDF and pixel coordinates:
+      {
+        "page_h_pts": float,
+        "scale": float,
+        "rects": [ { "text": "...", "box_pdf": (l,b,r,t), "box_px": (x,y,w,h) }, ... ],
+        "rects_px": [ (x,y,w,h), ... ],   # same order as "rects"
+        "rects_grid": RectGrid over rects_px,
+      }
+
+    Label search, text-overlap rejection and debug output all read from it,
+    so a page needs a single textpage and a single pass over its rects.
+
+    `keyword`: per-rect text is only extracted (one get_text_bounded call per
+    rect) when the page text contains it (case-insensitive); otherwise texts
+    are left empty. Label patterns that all require the keyword can never
+    match such a page anyway.
+    """
+    page_h_pts = float(page.get_height())
+    textpage = page.get_textpage()
+    try:
+        want_text = True
+        if keyword:
+            page_text = textpage.get_text_range() or ""
+            want_text = keyword.lower() in page_text.lower()
+
+        rects: List[Dict[str, Any]] = []
+        rects_px: List[Tuple[int, int, int, int]] = []
+        n = textpage.count_rects()
+        for i in range(n):
+            rect = textpage.get_rect(i)  # (l,b,r,t)
+            txt = ""
+            if want_text:
+                try:
+                    txt = (textpage.get_text_bounded(*rect) or "").strip()
+                except Exception:
+                    txt = ""
+            box_px = pdf_box_to_pixel_box(rect, page_h_pts, scale)
+            rects.append({"text": txt, "box_pdf": rect, "box_px": box_px})
+            rects_px.append(box_px)
+    finally:
+        textpage.close()
+
+    return {
+        "page_h_pts": page_h_pts,
+        "scale": scale,
+        "rects": rects,
+        "rects_px": rects_px,
+        "rects_grid": RectGrid(rects_px),
+    }
+
+
+def page_object_types(page: pdfium.PdfPage) -> Set[int]:
+    """
+    Types (pdfium_c.FPDF_PAGEOBJ_TEXT / PATH / IMAGE / SHADING / FORM) of the
+    page's top-level content objects. Read from the content stream, no render.
+    """
+    n = pdfium_c.FPDFPage_CountObjects(page)
+    return {pdfium_c.FPDFPageObj_GetType(pdfium_c.FPDFPage_GetObject(page, i)) for i in range(n)}
+
+
+def page_annotation_count(page: pdfium.PdfPage) -> int:
+    """Annotations (ink, stamps, form widgets...) are drawn by render() but are not page objects."""
+    return pdfium_c.FPDFPage_GetAnnotCount(page)
+
+
+def signature_counts(pdf: pdfium.PdfDocument) -> Tuple[int, int]:
+    """(signature form fields, of which hold a digital signature). Needs no form environment."""
+    n = pdfium_c.FPDF_GetSignatureCount(pdf)
+    signed = 0
+    for i in range(n):
+        sig = pdfium_c.FPDF_GetSignatureObject(pdf, i)
+        if sig and pdfium_c.FPDFSignatureObj_GetContents(sig, None, 0) > 0:
+            signed += 1
+    return n, signed
+
+
+def _annot_field_name(form: Any, annot: Any) -> str:
+    size = pdfium_c.FPDFAnnot_GetFormFieldName(form, annot, None, 0)
+    if size <= 2:
+        return ""
+    buf = ctypes.create_string_buffer(size)
+    pdfium_c.FPDFAnnot_GetFormFieldName(form, annot, ctypes.cast(buf, ctypes.POINTER(pdfium_c.FPDF_WCHAR)), size)
+    return buf.raw[:size - 2].decode("utf-16-le", errors="replace")
+
+
+def signature_widgets(source: PdfSource, scale: float) -> List[Dict[str, Any]]:
+    """
+    Widgets of the signature form fields, in page order:
+    [{"page": index, "name": field name, "box_px": (x,y,w,h) at `scale`, "signed": bool}].
+
+    Locating widgets needs pdfium's form environment, which also changes
+    how pages render; the document is therefore opened separately here.
+    "signed" is resolved per widget from its own field (see
+    _resolve_signed); invisible signatures have box_px None.
+    """
+    pdf = pdfium.PdfDocument(source)
+    try:
+        pdf.init_forms()
+        if pdf.formenv is None:
+            return []
+        form = pdf.formenv.raw
+        widgets = []
+        for pidx in range(len(pdf)):
+            page = pdf[pidx]
+            page_w, page_h = page_size_px(page, scale)
+            for i in range(pdfium_c.FPDFPage_GetAnnotCount(page)):
+                annot = pdfium_c.FPDFPage_GetAnnot(page, i)
+                try:
+                    if pdfium_c.FPDFAnnot_GetSubtype(annot) != pdfium_c.FPDF_ANNOT_WIDGET:
+                        continue
+                    if pdfium_c.FPDFAnnot_GetFormFieldType(form, annot) != pdfium_c.FPDF_FORMFIELD_SIGNATURE:
+                        continue
+                    rect = pdfium_c.FS_RECTF()
+                    if not pdfium_c.FPDFAnnot_GetRect(annot, rect):
+                        continue
+                    # page space -> render pixels (handles /Rotate and the crop box)
+                    corners = []
+                    for px, py in ((rect.left, rect.bottom), (rect.right, rect.top)):
+                        dx, dy = ctypes.c_int(), ctypes.c_int()
+                        pdfium_c.FPDF_PageToDevice(page, 0, 0, page_w, page_h, 0, px, py, dx, dy)
+                        corners.append((dx.value, dy.value))
+                    (x1, y1), (x2, y2) = corners
+                    box = None
+                    if x1 != x2 and y1 != y2:
+                        box = clamp_box((min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1)), page_w, page_h)
+                    widgets.append({
+                        "page": pidx,
+                        "name": _annot_field_name(form, annot),
+                        "box_px": box,
+                        "has_v": _has_signature_value(annot),
+                        "merged": bool(pdfium_c.FPDFAnnot_HasKey(annot, b"T")),
+                    })
+                finally:
+                    pdfium_c.FPDFPage_CloseAnnot(annot)
+            page.close()
+        _resolve_signed(widgets, signature_counts(pdf))
+        return widgets
+    finally:
+        pdf.close()
+
+
+def _has_signature_value(annot: Any) -> bool:
+    # a signature value is an (indirect) dictionary, never a string
+    if not pdfium_c.FPDFAnnot_HasKey(annot, b"V"):
+        return False
+    return pdfium_c.FPDFAnnot_GetValueType(annot, b"V") in (
+        pdfium_c.FPDF_OBJECT_DICTIONARY, pdfium_c.FPDF_OBJECT_REFERENCE)
+
+
+def _resolve_signed(widgets: List[Dict[str, Any]], counts: Tuple[int, int]) -> None:
+    """
+    Set "signed" on every widget from the /V of its own field.
+
+    A widget merged with its field (it has a /T) carries the /V itself.
+    A split widget's value sits on its /Parent field, which pdfium cannot
+    open; the parent is then resolved through the document's signature
+    objects (signature_counts), which are exactly the top-level /Sig
+    fields, i.e. those whose name has no ".". The signed ones among the
+    split top-level fields are known when all or none of them are signed;
+    otherwise, and for split widgets of nested fields, a widget counts as
+    unsigned and is checked for ink like any other field.
+    """
+    _, signed = counts
+    # top-level field names have no "." (their /T may not contain one)
+    top = [w for w in widgets if "." not in w["name"]]
+    merged = {w["name"] for w in top if w["merged"]}
+    merged_signed = {w["name"] for w in top if w["merged"] and w["has_v"]}
+    split = {w["name"] for w in top if not w["merged"]} - merged
+    all_split_signed = bool(split) and signed - len(merged_signed) == len(split)
+    for w in widgets:
+        if w["merged"] or w["has_v"]:
+            w["signed"] = w["has_v"]
+        else:
+            w["signed"] = all_split_signed and w["name"] in split
+        del w["has_v"], w["merged"]
+
+
+def page_size_px(page: pdfium.PdfPage, scale: float) -> Tuple[int, int]:
+    """(width, height) in pixels of a full-page render at `scale` (same rounding as pdfium's render)."""
+    return math.ceil(page.get_width() * scale), math.ceil(page.get_height() * scale)
+
+
+def union_box(boxes: Iterable[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+    """Smallest (x,y,w,h) box containing all given (x,y,w,h) boxes."""
+    boxes = list(boxes)
+    x1 = min(b[0] for b in boxes)
+    y1 = min(b[1] for b in boxes)
+    x2 = max(b[0] + b[2] for b in boxes)
+    y2 = max(b[1] + b[3] for b in boxes)
+    return x1, y1, x2 - x1, y2 - y1
+
+
+def render_page_gray(page: pdfium.PdfPage, scale: float) -> np.ndarray:
+    """
+    Render the full page straight into an 8-bit grayscale array of shape (H, W).
+
+    pdfium rasterizes into a single-channel bitmap and the array is a view
+    over that buffer (no RGBA -> BGR -> GRAY copies). The default bitmap
+    buffer is allocated by ctypes and referenced by the array, so the view
+    stays valid after the bitmap object goes away.
+    """
+    bitmap = page.render(scale=scale, grayscale=True)
+    return bitmap.to_numpy()
+
+
+def render_region_gray(page: pdfium.PdfPage, scale: float, region_px: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Render only `region_px` (x,y,w,h, in full-page pixel coords at `scale`)
+    straight into an 8-bit grayscale array of shape (h, w).
+
+    Uses pdfium's crop: pixels outside the region are never rasterized, so a
+    few small ROIs cost a few hundred KB instead of a full 220 DPI page
+    (Letter: 1870x2420 px, ~4.5 MB in gray, ~13.6 MB as BGR).
+    """
+    x, y, w, h = region_px
+    page_w, page_h = page_size_px(page, scale)
+    # pdfium converts crop to pixels with ceil(); stay just below whole pixels
+    eps = 1e-3
+    crop = (
+        max(0.0, x - eps) / scale,
+        max(0.0, page_h - (y + h) - eps) / scale,
+        max(0.0, page_w - (x + w) - eps) / scale,
+        max(0.0, y - eps) / scale,
+    )
+    bitmap = page.render(scale=scale, crop=crop, grayscale=True)
+    return bitmap.to_numpy()
+
+
+# pdfium bitmap formats returned by image decoding, and their conversions to gray
+_BITMAP_TO_GRAY = {
+    pdfium_c.FPDFBitmap_BGR: cv2.COLOR_BGR2GRAY,
+    pdfium_c.FPDFBitmap_BGRx: cv2.COLOR_BGRA2GRAY,
+    pdfium_c.FPDFBitmap_BGRA: cv2.COLOR_BGRA2GRAY,
+}
+
+
+def page_scan_image(page: pdfium.PdfPage, tolerance_pts: float = 1.0) -> Optional[np.ndarray]:
+    """
+    Decoded pixels of a scanned page, as an 8-bit grayscale array at the
+    image's native resolution (no page render, no resampling).
+
+    Only for pages that draw exactly one image, axis-aligned and covering
+    the whole crop box, besides an optional invisible OCR text layer; no
+    rotation, no annotations. Anything else (including stencil /ImageMask
+    images and images wrapped in Form XObjects) returns None and should
+    be rendered. Soft masks are not applied; scanners do not emit them.
+    """
+    if page.get_rotation() or page_annotation_count(page):
+        return None
+
+    image = None
+    for obj in page.get_objects(max_depth=0):
+        if obj.type == pdfium_c.FPDF_PAGEOBJ_TEXT and (
+            pdfium_c.FPDFTextObj_GetTextRenderMode(obj.raw) == pdfium_c.FPDF_TEXTRENDERMODE_INVISIBLE
+        ):
+            continue
+        if obj.type != pdfium_c.FPDF_PAGEOBJ_IMAGE or image is not None:
+            return None
+        image = obj
+    if image is None:
+        return None
+
+    a, b, c, d, e, f = image.get_matrix().get()
+    left, bottom, right, top = page.get_cropbox()
+    if b or c or a <= 0 or d <= 0:
+        return None
+    if (abs(e - left) > tolerance_pts or abs(f - bottom) > tolerance_pts
+            or abs(e + a - right) > tolerance_pts or abs(f + d - top) > tolerance_pts):
+        return None
+    if image.get_metadata().colorspace == pdfium_c.FPDF_COLORSPACE_UNKNOWN:
+        return None  # stencil mask: pixels are paint coverage, not gray levels
+
+    try:
+        bitmap = image.get_bitmap(render=False)
+    except pdfium.PdfiumError:
+        return None
+    pixels = bitmap.to_numpy()
+    if bitmap.format == pdfium_c.FPDFBitmap_Gray:
+        return pixels
+    if bitmap.format not in _BITMAP_TO_GRAY:
+        return None
+    return cv2.cvtColor(pixels, _BITMAP_TO_GRAY[bitmap.format])
+
+
+def scan_image_dpi(page: pdfium.PdfPage, image: np.ndarray) -> float:
+    """Resolution of a page_scan_image() over its page (the lower of both axes)."""
+    h, w = image.shape[:2]
+    return 72.0 * min(w / page.get_width(), h / page.get_height())
+
+
+def scan_region_gray(
+    page: pdfium.PdfPage,
+    image: np.ndarray,
+    scale: float,
+    region_px: Optional[Tuple[int, int, int, int]] = None,
+) -> np.ndarray:
+    """
+    What render_region_gray (or render_page_gray when region_px is None)
+    would return at `scale`, taken from the page_scan_image() instead:
+    the image rows/cols under the region, area-resampled to its size.
+    """
+    page_w, page_h = page_size_px(page, scale)
+    x, y, w, h = region_px if region_px is not None else (0, 0, page_w, page_h)
+    img_h, img_w = image.shape[:2]
+    sx = img_w / (page.get_width() * scale)
+    sy = img_h / (page.get_height() * scale)
+
+    x0 = min(img_w - 1, int(round(x * sx)))
+    y0 = min(img_h - 1, int(round(y * sy)))
+    x1 = min(img_w, max(x0 + 1, int(round((x + w) * sx))))
+    y1 = min(img_h, max(y0 + 1, int(round((y + h) * sy))))
+    crop = image[y0:y1, x0:x1]
+    if crop.shape == (h, w):
+        return crop
+    interpolation = cv2.INTER_AREA if crop.shape[1] >= w else cv2.INTER_LINEAR
+    return cv2.resize(crop, (w, h), interpolation=interpolation)
@@ -0,0 +1,1132 @@
+# backend/app/services/checker_engine.py
+#
+# One pipeline for all PDF signature checkers. A checker is a CheckerProfile
+# (label patterns, page policy, ROI geometry, candidate limits); the stages
+# below (text layer, render, binarize/clean, components, text-overlap
+# rejection) are shared, and each stage's wall time is reported in
+# report["timings_ms"].
+#
+#     report = run_checker(profile, "file.pdf")
+
+import functools
+import io
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Pattern, Tuple
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+from pydantic import BaseModel, ConfigDict
+
+from app.services.checker_common import (
+    REFERENCE_DPI,
+    pdfium_c,
+    PdfSource,
+    RectGrid,
+    build_text_index,
+    clamp_box,
+    component_candidates,
+    dpi_factor,
+    page_annotation_count,
+    page_object_types,
+    page_scan_image,
+    page_size_px,
+    rect_kernel,
+    render_page_gray,
+    render_region_gray,
+    scale_box,
+    scaled_odd,
+    scan_image_dpi,
+    scan_region_gray,
+    signature_counts,
+    signature_widgets,
+    source_name,
+    union_box,
+    unscale_box,
+)
+
+Box = Tuple[int, int, int, int]
+
+# Fallback scan parallelism: pages are split into contiguous ranges, one
+# range per worker process. Short documents are scanned in-process.
+# Only direct callers (benchmarks, bulk_check with one worker) get this:
+# the API's checker pool workers set it to 1 (app/core/checker_pool.py),
+# so an upload uses one core and the cores serve concurrent uploads.
+FALLBACK_MAX_WORKERS = int(os.getenv("SIGNATURE_FALLBACK_WORKERS", min(4, os.cpu_count() or 1)))
+FALLBACK_MIN_PAGES_PER_WORKER = 4
+
+# adaptiveThreshold constant: a pixel is ink when at least this much darker
+# than the (Gaussian) mean of its neighborhood
+INK_CONTRAST = 10
+
+
+# ----------------------------
+# Profiles
+# ----------------------------
+class RoiGeometry(BaseModel):
+    """Where to look for a signature around a label box (multiples of the label size / page size)."""
+    model_config = ConfigDict(frozen=True)
+
+    right_w_frac: float = 0.60
+    right_h_mult: float = 3.2
+    right_y_pad_mult: float = 1.0
+
+    below_w_frac_of_page: float = 0.75
+    below_h_mult: float = 9.0
+    below_y_gap_mult: float = 0.6
+
+    # around a signature form field's rect (multiples of its height): ink overflows the box
+    field_pad_mult: float = 0.5
+
+
+class CheckerProfile(BaseModel):
+    """
+    Declarative description of a checker. New checkers are a new profile;
+    the pipeline itself lives in run_checker().
+    """
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    # Bump whenever detection logic or thresholds change: part of the result cache key
+    version: str
+
+    label_patterns: Tuple[str, ...]
+    negative_label_patterns: Tuple[str, ...] = (
+        r"\bdigital\s+signature\b",
+        r"\be-?signature\b",
+    )
+    # Every positive pattern requires this word: pages without it skip per-rect text extraction
+    label_keyword: Optional[str] = "signature"
+
+    # Page policy:
+    # label_pages: pages searched for labels ("first_last" or "all"); if any of
+    #   them has a label, ONLY the ROIs next to those labels are checked.
+    # fallback_pages: pages scanned whole when no label was found ("none" to skip).
+    label_pages: Literal["first_last", "all"] = "all"
+    fallback_pages: Literal["none", "first_last", "all"] = "none"
+    label_mode: str = "LABEL_ROI_SCAN"
+    fallback_mode: str = "NO_FIELD_FALLBACK"
+
+    # Signature form fields come before the label search: a digital
+    # signature ends the check without rendering, otherwise the fields'
+    # rects are the ROIs (see _field_page_entry)
+    use_signature_fields: bool = True
+    field_mode: str = "SIGNATURE_FIELD"
+
+    roi: RoiGeometry = RoiGeometry()
+
+    # Candidate filtering (areas in pixels at REFERENCE_DPI, scaled to `dpi`)
+    dpi: int = REFERENCE_DPI
+    min_bbox_area: float = 250
+    max_bbox_area: float = 300_000
+    max_keep_per_roi: int = 2
+    max_keep_per_page_fallback: int = 3
+
+    # Discard candidates overlapping selectable PDF text by this fraction of their area
+    reject_text_overlap: bool = False
+    text_overlap_threshold: float = 0.15
+
+    # Coarse-to-fine: every ROI / fallback page is first analyzed at coarse_dpi
+    # (area limits scaled by DPI). Only regions the coarse pass cannot decide
+    # are rendered again at dpi.
+    adaptive_dpi: bool = True
+    coarse_dpi: int = 96
+    # no blob of even half the minimum size -> clearly blank
+    coarse_blank_area_factor: float = 0.5
+    # a blob of twice the minimum size survives all filters -> clearly signed
+    coarse_found_area_factor: float = 2.0
+
+    # Fallback pages that cannot hold a handwritten signature are skipped
+    # before binarization (see _prescreen_objects / _prescreen_ink)
+    fallback_prescreen: bool = True
+
+    # Scanned pages (one full-page image) are read from the decoded image
+    # instead of rendered, and never analyzed above the scan's own DPI
+    use_scan_images: bool = True
+
+
+# ----------------------------
+# Stage timing
+# ----------------------------
+class StageTimer:
+    """Wall time per pipeline stage, accumulated over pages and ROIs."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - t0
+
+    def add(self, seconds: Dict[str, float]) -> None:
+        for name, s in seconds.items():
+            self.seconds[name] += s
+
+    def as_ms(self) -> Dict[str, float]:
+        return {name: round(s * 1000, 2) for name, s in self.seconds.items()}
+
+
+# ----------------------------
+# Labels
+# ----------------------------
+def _normalize_quotes(s: str) -> str:
+    return (
+        s.replace("’", "'")
+        .replace("‘", "'")
+        .replace("“", '"')
+        .replace("”", '"')
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _compile(patterns: Tuple[str, ...]) -> Tuple[Pattern, ...]:
+    return tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+
+
+def _text_matches_label(profile: CheckerProfile, text: str) -> bool:
+    t = _normalize_quotes(text.strip())
+    if not t:
+        return False
+    for neg in _compile(profile.negative_label_patterns):
+        if neg.search(t):
+            return False
+    return any(p.search(t) for p in _compile(profile.label_patterns))
+
+
+def find_label_boxes(profile: CheckerProfile, text_index: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Find label hits in the page text index (see build_text_index).
+    Returns list: { "text": "...", "box_pdf": (l,b,r,t), "box_px": (x,y,w,h) }
+    """
+    return [r for r in text_index["rects"] if r["text"] and _text_matches_label(profile, r["text"])]
+
+
+def build_rois_for_label(
+    geometry: RoiGeometry, lx: int, ly: int, lw: int, lh: int, page_w: int, page_h: int
+) -> Tuple[Box, Box]:
+    """(right ROI, below ROI) of a label box, clamped to the page."""
+    g = geometry
+    # Right ROI
+    rx = lx + lw
+    ry = int(max(0, ly - (g.right_y_pad_mult * lh)))
+    rw = int(max(1, (page_w - rx) * g.right_w_frac))
+    rh = int(min(page_h - ry, max(1, lh * g.right_h_mult)))
+
+    # Below ROI
+    bx = int(max(0, lx))
+    by = int(min(page_h - 1, ly + lh + (g.below_y_gap_mult * lh)))
+    bw = int(min(page_w - bx, page_w * g.below_w_frac_of_page))
+    bh = int(min(page_h - by, max(1, lh * g.below_h_mult)))
+
+    # Clamp
+    rx = max(0, min(page_w - 1, rx))
+    ry = max(0, min(page_h - 1, ry))
+    rw = max(1, min(page_w - rx, rw))
+    rh = max(1, min(page_h - ry, rh))
+
+    bx = max(0, min(page_w - 1, bx))
+    by = max(0, min(page_h - 1, by))
+    bw = max(1, min(page_w - bx, bw))
+    bh = max(1, min(page_h - by, bh))
+
+    return (rx, ry, rw, rh), (bx, by, bw, bh)
+
+
+# ----------------------------
+# Image processing
+# ----------------------------
+def _blur(gray: np.ndarray, dpi: int = REFERENCE_DPI) -> np.ndarray:
+    k = scaled_odd(5, dpi_factor(dpi))
+    return cv2.GaussianBlur(gray, (k, k), 0)
+
+
+def _threshold(blurred: np.ndarray, dpi: int = REFERENCE_DPI) -> np.ndarray:
+    return cv2.adaptiveThreshold(
+        blurred, 255,
+        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY_INV,
+        scaled_odd(31, dpi_factor(dpi)), INK_CONTRAST
+    )
+
+
+def _binarize(gray: np.ndarray, dpi: int = REFERENCE_DPI) -> np.ndarray:
+    return _threshold(_blur(gray, dpi), dpi)
+
+
+def _remove_table_lines(bw: np.ndarray, dpi: int = REFERENCE_DPI) -> np.ndarray:
+    h, w = bw.shape
+    min_len = max(2, int(round(30 * dpi_factor(dpi))))
+    h_lines = cv2.morphologyEx(bw, cv2.MORPH_OPEN, rect_kernel(max(min_len, w // 25), 1), iterations=1)
+    v_lines = cv2.morphologyEx(bw, cv2.MORPH_OPEN, rect_kernel(1, max(min_len, h // 25)), iterations=1)
+
+    lines = cv2.bitwise_or(h_lines, v_lines)
+    cleaned = cv2.bitwise_and(bw, cv2.bitwise_not(lines))
+    return cleaned
+
+
+def _despeckle(bw: np.ndarray, dpi: int = REFERENCE_DPI) -> np.ndarray:
+    # 3x3 opening at the reference DPI; below ~1.5 px it would erase strokes
+    k = int(round(3 * dpi_factor(dpi)))
+    if k < 2:
+        return bw
+    return cv2.morphologyEx(bw, cv2.MORPH_OPEN, rect_kernel(k, k), iterations=1)
+
+
+def _clean_blurred(blurred: np.ndarray, dpi: int = REFERENCE_DPI) -> np.ndarray:
+    """Threshold + remove table lines + despeckle an already blurred render."""
+    bw = _threshold(blurred, dpi)
+    bw = _remove_table_lines(bw, dpi)
+    return _despeckle(bw, dpi)
+
+
+def _clean_roi_pairs(
+    gray: np.ndarray,
+    origin: Tuple[int, int],
+    rois: Dict[int, Box],
+    dpi: int = REFERENCE_DPI,
+) -> Dict[int, np.ndarray]:
+    """
+    Clean the ROIs of a rendered region, a label's right/below pair together.
+    `rois` maps flat ROI index (2*label + 0 right / 1 below) to its box in
+    page pixels; `origin` is the page position of gray[0, 0].
+    The pair overlaps around the label, so blur + adaptive threshold (the
+    costly part) run once over its union; table-line removal, whose kernels
+    depend on the ROI size, and despeckle run per ROI on slices of that.
+    Returns {index: cleaned ROI mask}.
+    """
+    ox, oy = origin
+    by_label: Dict[int, List[int]] = {}
+    for i in rois:
+        by_label.setdefault(i // 2, []).append(i)
+
+    cleaned = {}
+    for idxs in by_label.values():
+        ux, uy, uw, uh = union_box(rois[i] for i in idxs)
+        bw = _binarize(gray[uy - oy:uy - oy + uh, ux - ox:ux - ox + uw], dpi)
+        for i in idxs:
+            x, y, w, h = rois[i]
+            roi_bw = _remove_table_lines(bw[y - uy:y - uy + h, x - ux:x - ux + w], dpi)
+            cleaned[i] = _despeckle(roi_bw, dpi)
+    return cleaned
+
+
+# ----------------------------
+# Detection
+# ----------------------------
+def _filter_text_overlaps(
+    profile: CheckerProfile,
+    cands: List[Tuple[float, int, int, int, int]],
+    offset: Tuple[int, int],
+    text_grid: Optional[RectGrid],
+    dpi: int,
+) -> List[Dict[str, Any]]:
+    """
+    Turn component candidates into report candidates (page pixels at `dpi`),
+    dropping those that overlap selectable text when the profile asks for it.
+    All candidates are checked against the page's text grid (profile.dpi
+    pixels) in one vectorized query.
+    """
+    ox, oy = offset
+    boxes = [(int(ox + x), int(oy + y), int(w), int(h)) for (_, x, y, w, h) in cands]
+    keep = [True] * len(boxes)
+    if profile.reject_text_overlap and text_grid is not None and len(text_grid) and boxes:
+        f = dpi / float(profile.dpi)
+        query = boxes if dpi == profile.dpi else [unscale_box(b, f) for b in boxes]
+        ratios = text_grid.max_overlap_ratios(query)
+        keep = [r < profile.text_overlap_threshold for r in ratios]
+    return [
+        {"score": float(c[0]), "bbox_px": list(b)}
+        for c, b, k in zip(cands, boxes, keep) if k
+    ]
+
+
+def _detect(
+    profile: CheckerProfile,
+    timer: StageTimer,
+    mask: np.ndarray,
+    offset: Tuple[int, int],
+    text_grid: Optional[RectGrid],
+    max_keep: int,
+    dpi: int,
+    min_area_factor: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    Signature-like blobs in a cleaned mask whose top-left corner is at page
+    pixel `offset` (at `dpi`). Area limits are given at the reference DPI and
+    scaled to `dpi`; `min_area_factor` tightens or relaxes the minimum
+    (coarse pass). Scores are in reference-DPI units, comparable across DPIs.
+    Returns: { found, candidates, mask }
+    """
+    area_f = dpi_factor(dpi) ** 2
+    with timer.stage("components"):
+        cands = component_candidates(
+            mask,
+            max_keep,
+            min_area=profile.min_bbox_area * min_area_factor * area_f,
+            max_area=profile.max_bbox_area * area_f,
+            score_scale=area_f,
+        )
+    with timer.stage("text_overlap"):
+        candidates = _filter_text_overlaps(profile, cands, offset, text_grid, dpi)
+    return {"found": len(candidates) > 0, "candidates": candidates, "mask": mask}
+
+
+def _coarse_verdict(
+    profile: CheckerProfile, detect: Callable[[float], Dict[str, Any]]
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    `detect(min_area_factor)` runs a detector on the coarse render.
+    Returns ("BLANK" | "FOUND" | "AMBIGUOUS", detection result).
+    """
+    relaxed = detect(profile.coarse_blank_area_factor)
+    if not relaxed["found"]:
+        return "BLANK", relaxed
+    strict = detect(profile.coarse_found_area_factor)
+    if strict["found"]:
+        return "FOUND", strict
+    return "AMBIGUOUS", relaxed
+
+
+def _to_reference_px(result: Dict[str, Any], factor: float) -> Dict[str, Any]:
+    """Map a coarse detection result's boxes back to profile.dpi page pixels."""
+    candidates = [
+        {**c, "bbox_px": list(unscale_box(tuple(c["bbox_px"]), factor))}
+        for c in result["candidates"]
+    ]
+    return {**result, "candidates": candidates}
+
+
+class _PageRaster:
+    """
+    Grayscale pixels of one page at any DPI: pdfium renders, or for scanned
+    pages (see page_scan_image) crops of the decoded scan image, which skips
+    the compositing render and never upsamples a low-resolution scan.
+    """
+
+    def __init__(self, profile: CheckerProfile, timer: StageTimer, page: pdfium.PdfPage):
+        self.page = page
+        self.timer = timer
+        self.scan: Optional[np.ndarray] = None
+        if profile.use_scan_images:
+            with timer.stage("decode"):
+                self.scan = page_scan_image(page)
+        self.max_dpi = profile.dpi
+        if self.scan is not None:
+            self.max_dpi = max(1, min(profile.dpi, int(scan_image_dpi(page, self.scan))))
+
+    def gray(self, dpi: int, region_px: Optional[Box] = None) -> np.ndarray:
+        scale = dpi / 72.0
+        with self.timer.stage("render"):
+            if self.scan is not None:
+                return scan_region_gray(self.page, self.scan, scale, region_px)
+            if region_px is None:
+                return render_page_gray(self.page, scale)
+            return render_region_gray(self.page, scale, region_px)
+
+
+def _stage_dpis(profile: CheckerProfile, raster: _PageRaster) -> List[int]:
+    """DPIs to analyze at, in order: [coarse, fine] or just [fine]."""
+    fine = raster.max_dpi
+    if profile.adaptive_dpi and profile.coarse_dpi < fine:
+        return [profile.coarse_dpi, fine]
+    return [fine]
+
+
+def _detect_rois(
+    profile: CheckerProfile,
+    timer: StageTimer,
+    raster: _PageRaster,
+    flat: List[Box],
+    text_grid: Optional[RectGrid],
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Run ROI detection for every ROI of a page (profile.dpi pixels).
+    Returns ([result per ROI], highest DPI rendered).
+    Each stage only renders the union of the ROIs still undecided; the
+    coarse stage settles clearly blank or clearly signed ROIs.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(flat)
+    todo = list(range(len(flat)))
+    dpis = _stage_dpis(profile, raster)
+    used_dpi = dpis[0]
+
+    for stage, dpi in enumerate(dpis):
+        if not todo:
+            break
+        final = stage == len(dpis) - 1
+        f = dpi / float(profile.dpi)
+        if dpi == profile.dpi:
+            stage_rois = {i: flat[i] for i in todo}
+        else:
+            page_w, page_h = page_size_px(raster.page, dpi / 72.0)
+            stage_rois = {i: clamp_box(scale_box(flat[i], f), page_w, page_h) for i in todo}
+        region = union_box(stage_rois.values())
+        gray = raster.gray(dpi, region)
+        with timer.stage("clean"):
+            masks = _clean_roi_pairs(gray, region[:2], stage_rois, dpi)
+        used_dpi = dpi
+
+        undecided = []
+        for i in todo:
+            # the cleaned mask is shared by both coarse passes
+            detect = lambda k: _detect(
+                profile, timer, masks[i], stage_rois[i][:2], text_grid,
+                profile.max_keep_per_roi, dpi, min_area_factor=k,
+            )
+            verdict, res = ("FINAL", detect(1.0)) if final else _coarse_verdict(profile, detect)
+            if verdict == "AMBIGUOUS":
+                undecided.append(i)
+            else:
+                results[i] = res if dpi == profile.dpi else _to_reference_px(res, f)
+        todo = undecided
+
+    return results, used_dpi
+
+
+def _prescreen_objects(profile: CheckerProfile, page: pdfium.PdfPage) -> Optional[str]:
+    """
+    Skip reason decided from the page's content objects alone (no render):
+    "BLANK" when it draws nothing, "TEXT_ONLY" when it only draws text and
+    candidates over text are rejected anyway. None: the page must be rendered.
+    """
+    if page_annotation_count(page):
+        return None  # e.g. an ink annotation signature
+    types = page_object_types(page)
+    if not types:
+        return "BLANK"
+    if profile.reject_text_overlap and types == {pdfium_c.FPDF_PAGEOBJ_TEXT}:
+        return "TEXT_ONLY"
+    return None
+
+
+def _prescreen_ink(
+    profile: CheckerProfile,
+    blurred: np.ndarray,
+    dpi: int,
+    text_rects_px: List[Box],
+    min_area_factor: float,
+) -> Optional[str]:
+    """
+    Skip reason from a low-resolution ink count of the blurred render.
+
+    adaptiveThreshold marks a pixel when it is <= its neighborhood mean - INK_CONTRAST,
+    and no mean exceeds the brightest pixel, so pixels <= max - INK_CONTRAST bound the
+    ink the detector can ever see. Fewer of them than the smallest accepted blob
+    -> "BLANK" (the detector would find nothing either). When candidates over text
+    are rejected, ink inside the text layer's rects is not counted -> "TEXT_ONLY".
+    """
+    min_area = profile.min_bbox_area * min_area_factor * dpi_factor(dpi) ** 2
+    ink = blurred <= int(blurred.max()) - INK_CONTRAST
+    if np.count_nonzero(ink) < min_area:
+        return "BLANK"
+    if not (profile.reject_text_overlap and text_rects_px):
+        return None
+
+    f = dpi / float(profile.dpi)
+    for box in text_rects_px:
+        # 1 px margin for anti-aliased glyph edges
+        x, y, w, h = scale_box(box, f)
+        ink[max(0, y - 1):y + h + 1, max(0, x - 1):x + w + 1] = False
+    if np.count_nonzero(ink) < min_area:
+        return "TEXT_ONLY"
+    return None
+
+
+def _detect_fallback_page(
+    profile: CheckerProfile, timer: StageTimer, raster: _PageRaster, text_index: Dict[str, Any]
+) -> Tuple[Dict[str, Any], int, Optional[str]]:
+    """
+    Fallback scan of a whole page, coarse first.
+    Returns (result, DPI rendered, skip reason or None).
+    """
+    keep = profile.max_keep_per_page_fallback
+    text_grid = text_index["rects_grid"]
+    dpis = _stage_dpis(profile, raster)
+
+    for stage, dpi in enumerate(dpis):
+        final = stage == len(dpis) - 1
+        gray = raster.gray(dpi)
+        with timer.stage("clean"):
+            blurred = _blur(gray, dpi)
+        if stage == 0 and profile.fallback_prescreen:
+            min_area_factor = 1.0 if final else profile.coarse_blank_area_factor
+            with timer.stage("prescreen"):
+                skipped = _prescreen_ink(profile, blurred, dpi, text_index["rects_px"], min_area_factor)
+            if skipped:
+                return {"found": False, "candidates": [], "mask": None}, dpi, skipped
+        with timer.stage("clean"):
+            mask = _clean_blurred(blurred, dpi)
+
+        detect = lambda k: _detect(profile, timer, mask, (0, 0), text_grid, keep, dpi, min_area_factor=k)
+        verdict, res = ("FINAL", detect(1.0)) if final else _coarse_verdict(profile, detect)
+        if verdict != "AMBIGUOUS":
+            if dpi != profile.dpi:
+                res = _to_reference_px(res, dpi / float(profile.dpi))
+            return res, dpi, None
+
+
+# ----------------------------
+# Pages
+# ----------------------------
+def _text_index(
+    profile: CheckerProfile,
+    timer: StageTimer,
+    pdf: pdfium.PdfDocument,
+    pidx: int,
+    cache: Dict[int, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """The page's text index (see build_text_index), built once per page and document."""
+    if pidx not in cache:
+        with timer.stage("text"):
+            cache[pidx] = build_text_index(pdf[pidx], profile.dpi / 72.0, keyword=profile.label_keyword)
+    return cache[pidx]
+
+
+def _label_page_entry(
+    profile: CheckerProfile,
+    timer: StageTimer,
+    pdf: pdfium.PdfDocument,
+    pidx: int,
+    hits: List[Dict[str, Any]],
+    text_index: Dict[str, Any],
+    artifacts: Optional["DebugArtifacts"],
+) -> Dict[str, Any]:
+    """Check the ROIs next to a page's label hits; masks go to `artifacts` when given."""
+    page_entry: Dict[str, Any] = {"page": pidx + 1, "page_status": "NOT_FOUND", "hits": []}
+    if artifacts is not None:
+        page_entry["text_rects"] = len(text_index["rects_px"])
+    if not hits:
+        return page_entry
+
+    page = pdf[pidx]
+    W, H = page_size_px(page, profile.dpi / 72.0)
+
+    # Only the ROIs are rendered (coarse first, see _detect_rois)
+    rois = [build_rois_for_label(profile.roi, *hit["box_px"], W, H) for hit in hits]
+    flat_results, page_entry["dpi"] = _detect_rois(
+        profile, timer, _PageRaster(profile, timer, page), [r for pair in rois for r in pair],
+        text_index["rects_grid"],
+    )
+    roi_results = list(zip(flat_results[0::2], flat_results[1::2]))
+
+    for hit_i, (hit, roi_pair, (right, below)) in enumerate(zip(hits, rois, roi_results), start=1):
+        lx, ly, lw, lh = hit["box_px"]
+        (rx, ry, rw, rh), (bx, by, bw, bh) = roi_pair
+
+        found = right["found"] or below["found"]
+
+        candidates = []
+        if right["found"]:
+            for c in right["candidates"]:
+                candidates.append({"where": "RIGHT", **c})
+        if below["found"]:
+            for c in below["candidates"]:
+                candidates.append({"where": "BELOW", **c})
+
+        page_entry["hits"].append({
+            "label_or_pattern": hit["text"],
+            "hit_index": hit_i,
+            "status": "FOUND" if found else "NOT_FOUND",
+            "label_box_px": [int(lx), int(ly), int(lw), int(lh)],
+            "right_roi_px": [int(rx), int(ry), int(rw), int(rh)],
+            "below_roi_px": [int(bx), int(by), int(bw), int(bh)],
+            "candidates": candidates,
+        })
+
+        if artifacts is not None:
+            artifacts.add_mask(f"p{pidx+1}_hit{hit_i}_mask_right.png", right["mask"])
+            artifacts.add_mask(f"p{pidx+1}_hit{hit_i}_mask_below.png", below["mask"])
+
+        if found:
+            page_entry["page_status"] = "FOUND"
+
+    return page_entry
+
+
+def _signature_fields(
+    profile: CheckerProfile, timer: StageTimer, pdf: pdfium.PdfDocument, source: PdfSource
+) -> Tuple[int, Optional[List[Dict[str, Any]]]]:
+    """
+    Returns (digitally signed fields, widgets to report) from the form
+    fields; widgets is None when the document has no usable signature field
+    (label search as usual). Once a field is signed, only the signed
+    widgets are reported and nothing else is checked.
+    """
+    if not profile.use_signature_fields:
+        return 0, None
+    with timer.stage("fields"):
+        n_fields, signed = signature_counts(pdf)
+        if not n_fields:
+            return 0, None
+        widgets = signature_widgets(source, profile.dpi / 72.0)
+    if signed:
+        return signed, [w for w in widgets if w["signed"]]
+    widgets = [w for w in widgets if w["box_px"] is not None]
+    return 0, (widgets or None)
+
+
+def _field_page_entry(
+    profile: CheckerProfile,
+    timer: StageTimer,
+    pdf: pdfium.PdfDocument,
+    pidx: int,
+    widgets: List[Dict[str, Any]],
+    text_index_for: Callable[[], Dict[str, Any]],
+    artifacts: Optional["DebugArtifacts"],
+) -> Dict[str, Any]:
+    """
+    Check a page's signature form fields. Digitally signed fields are FOUND
+    without rendering; the others are searched for ink in their rect, padded
+    by profile.roi.field_pad_mult of its height.
+    """
+    page_entry: Dict[str, Any] = {"page": pidx + 1, "page_status": "NOT_FOUND", "hits": []}
+    unsigned = [i for i, w in enumerate(widgets) if not w["signed"]]
+    rois: Dict[int, Box] = {}
+    results: Dict[int, Dict[str, Any]] = {}
+    if unsigned:
+        page = pdf[pidx]
+        W, H = page_size_px(page, profile.dpi / 72.0)
+        for i in unsigned:
+            x, y, w, h = widgets[i]["box_px"]
+            pad = int(round(h * profile.roi.field_pad_mult))
+            rois[i] = clamp_box((x - pad, y - pad, w + 2 * pad, h + 2 * pad), W, H)
+        found, page_entry["dpi"] = _detect_rois(
+            profile, timer, _PageRaster(profile, timer, page), [rois[i] for i in unsigned],
+            text_index_for()["rects_grid"],
+        )
+        results = dict(zip(unsigned, found))
+        if artifacts is not None:
+            page_entry["text_rects"] = len(text_index_for()["rects_px"])
+
+    for i, widget in enumerate(widgets):
+        res = results.get(i)
+        found = widget["signed"] or (res is not None and res["found"])
+        roi = rois.get(i)
+        page_entry["hits"].append({
+            "label_or_pattern": widget["name"] or None,
+            "hit_index": i + 1,
+            "status": "FOUND" if found else "NOT_FOUND",
+            "label_box_px": None,
+            "right_roi_px": None,
+            "below_roi_px": None,
+            "field_box_px": [int(v) for v in widget["box_px"]] if widget["box_px"] else None,
+            "field_roi_px": [int(v) for v in roi] if roi else None,
+            "digitally_signed": widget["signed"],
+            "candidates": [{"where": "FIELD", **c} for c in res["candidates"]] if res and res["found"] else [],
+        })
+        if artifacts is not None and res is not None:
+            artifacts.add_mask(f"p{pidx+1}_field{i+1}_mask.png", res["mask"])
+        if found:
+            page_entry["page_status"] = "FOUND"
+
+    return page_entry
+
+
+def _fallback_page_entry(
+    profile: CheckerProfile,
+    timer: StageTimer,
+    page: pdfium.PdfPage,
+    pidx: int,
+    text_index_for: Callable[[], Dict[str, Any]],
+    debug: bool,
+) -> Tuple[Dict[str, Any], Optional[np.ndarray]]:
+    """
+    Render + fallback-scan one page. Returns (page_entry, mask if debug else None).
+    Pages the prescreen rejects get "skipped": "BLANK" | "TEXT_ONLY" and no candidates.
+    """
+    skipped = None
+    if profile.fallback_prescreen:
+        with timer.stage("prescreen"):
+            skipped = _prescreen_objects(profile, page)
+
+    if skipped:
+        fb, used_dpi = {"found": False, "candidates": [], "mask": None}, None
+    else:
+        fb, used_dpi, skipped = _detect_fallback_page(
+            profile, timer, _PageRaster(profile, timer, page), text_index_for()
+        )
+
+    page_entry = {
+        "page": pidx + 1,
+        "page_status": "FOUND" if fb["found"] else "NOT_FOUND",
+        "dpi": used_dpi,
+        "hits": [{
+            "label_or_pattern": None,
+            "hit_index": 1,
+            "status": "FOUND" if fb["found"] else "NOT_FOUND",
+            "label_box_px": None,
+            "right_roi_px": None,
+            "below_roi_px": None,
+            "candidates": [{"where": "FALLBACK", **c} for c in fb["candidates"]],
+        }],
+    }
+    if skipped:
+        page_entry["skipped"] = skipped
+    if debug:
+        page_entry["text_rects"] = len(text_index_for()["rects_px"])
+
+    return page_entry, (fb["mask"] if debug else None)
+
+
+def _fallback_scan_range(
+    profile: CheckerProfile, source: PdfSource, page_indices: List[int], debug: bool
+) -> Tuple[List[Tuple[Dict[str, Any], Optional[np.ndarray]]], Dict[str, float]]:
+    """
+    Worker entry point: open the document once and fallback-scan a range of pages.
+    Returns (results, stage seconds).
+    """
+    timer = StageTimer()
+    with timer.stage("open"):
+        pdf = pdfium.PdfDocument(source)
+    try:
+        results = []
+        text_indexes: Dict[int, Dict[str, Any]] = {}
+        for pidx in page_indices:
+            text_index_for = functools.partial(_text_index, profile, timer, pdf, pidx, text_indexes)
+            results.append(_fallback_page_entry(profile, timer, pdf[pidx], pidx, text_index_for, debug))
+        return results, dict(timer.seconds)
+    finally:
+        pdf.close()
+
+
+_fallback_pool: Optional[ProcessPoolExecutor] = None
+_fallback_pool_lock = threading.Lock()
+
+
+def _get_fallback_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all fallback scans, created on first use."""
+    global _fallback_pool
+    with _fallback_pool_lock:
+        if _fallback_pool is None:
+            # spawn: pdfium and the server's threads do not survive fork() safely
+            _fallback_pool = ProcessPoolExecutor(
+                max_workers=FALLBACK_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _fallback_pool
+
+
+# ----------------------------
+# Debug output
+# ----------------------------
+# masks kept per debug bundle (see DebugArtifacts)
+DEBUG_MAX_MASKS = 100
+
+_png_pool: Optional[ThreadPoolExecutor] = None
+_png_pool_lock = threading.Lock()
+
+
+def _get_png_pool() -> ThreadPoolExecutor:
+    """Threads encoding debug masks (cv2.imencode releases the GIL), created on first use."""
+    global _png_pool
+    with _png_pool_lock:
+        if _png_pool is None:
+            _png_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="checker-png")
+        return _png_pool
+
+
+def _encode_png(mask: np.ndarray) -> bytes:
+    ok, buf = cv2.imencode(".png", mask)
+    if not ok:
+        raise ValueError("PNG encoding failed")
+    return buf.tobytes()
+
+
+class DebugArtifacts:
+    """
+    Debug output of one check, kept in memory: masks are PNG-encoded on
+    worker threads while the check goes on, then bundled with report.json
+    into one ZIP by to_zip(). Nothing touches the disk.
+
+    At most max_masks masks are kept (the first ones, in page order), so a
+    long scanned document cannot blow up the bundle; the others are only
+    counted (report["debug"]["omitted"]).
+    """
+
+    def __init__(self, max_masks: int = DEBUG_MAX_MASKS):
+        self._pngs: Dict[str, Future] = {}
+        self.max_masks = max_masks
+        self.omitted = 0
+
+    def add_mask(self, name: str, mask: np.ndarray) -> None:
+        if len(self._pngs) >= self.max_masks:
+            self.omitted += 1
+            return
+        self._pngs[name] = _get_png_pool().submit(_encode_png, mask)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._pngs)
+
+    def to_zip(self, report: Dict[str, Any]) -> bytes:
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            zf.writestr("report.json", json.dumps(report, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+            for name, png in self._pngs.items():
+                # PNG is compressed already: stored as is
+                zf.writestr(name, png.result())
+        return buf.getvalue()
+
+
+def _split_ranges(indices: List[int], parts: int) -> List[List[int]]:
+    """Split into `parts` contiguous, near-equal chunks (order preserved)."""
+    size, extra = divmod(len(indices), parts)
+    chunks, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(indices[start:end])
+        start = end
+    return chunks
+
+
+def _policy_pages(policy: str, page_count: int) -> List[int]:
+    if policy == "none":
+        return []
+    if policy == "first_last":
+        last = max(0, page_count - 1)
+        return [0] + ([last] if last != 0 else [])
+    return list(range(page_count))
+
+
+# ----------------------------
+# Main callables
+# ----------------------------
+def iter_checker(
+    profile: CheckerProfile,
+    source: PdfSource,
+    filename: Optional[str] = None,
+    stop_at_first_found: bool = False,
+    artifacts: Optional[DebugArtifacts] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming form of run_checker: yields the report in pieces, each one
+    JSON-ready, as soon as it is known:
+      {"event": "start", "ok": true, "checker", "file", "page_count", "mode"}
+      {"event": "page", "page": 1, "page_status", ...}   one per page entry, in page order
+      {"event": "done", "overall_status", "timings_ms", ...}   the remaining report keys
+
+    Only the page being analyzed is held in memory (its text index, render
+    and masks). Label-only profiles (fallback_pages="none") also read the
+    text layer page by page. Closing the generator stops the check after
+    the current page. Debug masks go to `artifacts` when given.
+    """
+    t_start = time.perf_counter()
+    timer = StageTimer()
+    debug = artifacts is not None
+
+    with timer.stage("open"):
+        pdf = pdfium.PdfDocument(source)
+    try:
+        page_count = len(pdf)
+
+        # One text-layer pass per page, shared by label search and overlap
+        # rejection; entries are dropped once their page is reported
+        text_indexes: Dict[int, Dict[str, Any]] = {}
+
+        def text_index_for(pidx: int) -> Dict[str, Any]:
+            return _text_index(profile, timer, pdf, pidx, text_indexes)
+
+        # Pass 0: signature form fields, no rendering
+        signed_fields, widgets = _signature_fields(profile, timer, pdf, source)
+        fallback_indices: List[int] = []
+        if widgets is not None:
+            mode = profile.field_mode
+            field_pages = sorted({w["page"] for w in widgets})
+            page_items: Iterator[Tuple[int, Any]] = (
+                (pidx, [w for w in widgets if w["page"] == pidx]) for pidx in field_pages
+            )
+            n_pages = len(field_pages)
+
+            def check_page(pidx: int, page_widgets: List[Dict[str, Any]]) -> Dict[str, Any]:
+                return _field_page_entry(
+                    profile, timer, pdf, pidx, page_widgets, functools.partial(text_index_for, pidx), artifacts
+                )
+        else:
+            # Pass 1: text layer only, no rendering
+            label_pages = _policy_pages(profile.label_pages, page_count)
+            n_pages = len(label_pages)
+            if profile.fallback_pages == "none":
+                # the mode cannot change: labels are looked up while streaming
+                page_items = ((pidx, None) for pidx in label_pages)
+            else:
+                hits_list = [(pidx, find_label_boxes(profile, text_index_for(pidx))) for pidx in label_pages]
+                any_field_found = any(hits for _, hits in hits_list)
+                if not any_field_found:
+                    fallback_indices = _policy_pages(profile.fallback_pages, page_count)
+                page_items = iter(hits_list)
+            mode = profile.fallback_mode if fallback_indices else profile.label_mode
+
+            def check_page(pidx: int, hits: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+                if hits is None:
+                    hits = find_label_boxes(profile, text_index_for(pidx))
+                return _label_page_entry(profile, timer, pdf, pidx, hits, text_index_for(pidx), artifacts)
+
+        start: Dict[str, Any] = {
+            "event": "start",
+            "ok": True,
+            "checker": profile.name,
+            "file": source_name(source, filename),
+            "page_count": page_count,
+            "mode": mode,
+        }
+        yield start
+
+        done: Dict[str, Any] = {"event": "done"}
+        # a digital signature settles the document
+        overall_found = signed_fields > 0
+        if widgets is not None:
+            done["signed_fields"] = signed_fields
+
+        if not fallback_indices:
+            # Pass 2: render and analyze only the ROIs of fields / next to label hits
+            for n, (pidx, items) in enumerate(page_items, start=1):
+                page_entry = check_page(pidx, items)
+                text_indexes.pop(pidx, None)
+                if page_entry["page_status"] == "FOUND":
+                    overall_found = True
+                yield {"event": "page", **page_entry}
+
+                if stop_at_first_found and overall_found:
+                    done["stopped_early"] = n < n_pages
+                    break
+        else:
+            skipped_pages = 0
+            results = _fallback_results(
+                profile, timer, pdf, source, fallback_indices, text_index_for, text_indexes, debug
+            )
+            for n, (page_entry, mask) in enumerate(results, start=1):
+                if debug and mask is not None:
+                    artifacts.add_mask(f"p{page_entry['page']}_fallback_mask.png", mask)
+                if page_entry.get("skipped"):
+                    skipped_pages += 1
+                if page_entry["page_status"] == "FOUND":
+                    overall_found = True
+                yield {"event": "page", **page_entry}
+
+                if stop_at_first_found and overall_found:
+                    # closing `results` cancels the chunks not started yet
+                    results.close()
+                    done["stopped_early"] = n < len(fallback_indices)
+                    break
+            done["skipped_pages"] = skipped_pages
+
+        done["overall_status"] = "FOUND" if overall_found else "NOT_FOUND"
+        done["timings_ms"] = {**timer.as_ms(), "total": round((time.perf_counter() - t_start) * 1000, 2)}
+        yield done
+    finally:
+        pdf.close()
+
+
+def _fallback_results(
+    profile: CheckerProfile,
+    timer: StageTimer,
+    pdf: pdfium.PdfDocument,
+    source: PdfSource,
+    fallback_indices: List[int],
+    text_index_for: Callable[[int], Dict[str, Any]],
+    text_indexes: Dict[int, Dict[str, Any]],
+    debug: bool,
+) -> Iterator[Tuple[Dict[str, Any], Optional[np.ndarray]]]:
+    """Fallback-scan the pages, in page order; long documents in worker processes."""
+    workers = min(FALLBACK_MAX_WORKERS, len(fallback_indices) // FALLBACK_MIN_PAGES_PER_WORKER)
+    if workers <= 1:
+        for pidx in fallback_indices:
+            yield _fallback_page_entry(
+                profile, timer, pdf[pidx], pidx, functools.partial(text_index_for, pidx), debug
+            )
+            text_indexes.pop(pidx, None)
+        return
+
+    pool = _get_fallback_pool()
+    futures = [
+        pool.submit(_fallback_scan_range, profile, source, chunk, debug)
+        for chunk in _split_ranges(fallback_indices, workers)
+    ]
+    try:
+        # chunks are contiguous and submitted in order -> results stay in page order
+        for fut in futures:
+            chunk_results, seconds = fut.result()
+            timer.add(seconds)
+            yield from chunk_results
+    finally:
+        # stopped early: drop the chunks not started yet
+        for fut in futures:
+            fut.cancel()
+
+
+def run_checker(
+    profile: CheckerProfile,
+    source: PdfSource,
+    filename: Optional[str] = None,
+    stop_at_first_found: bool = False,
+    artifacts: Optional[DebugArtifacts] = None,
+) -> Dict[str, Any]:
+    """
+    Run the checker described by `profile`.
+
+    `source`: PDF file path or the PDF bytes; `filename` overrides the reported name.
+    Returns JSON only, writes nothing to disk. With `artifacts`, the masks
+    of every analyzed ROI/page are collected there (up to its max_masks)
+    and report["debug"] lists their names (see run_checker_debug_bundle).
+
+    Signature form fields are looked at first: a digitally signed field
+    settles the document without rendering, and unsigned fields' rects are
+    the only ROIs checked (mode profile.field_mode). Without fields, labels
+    are looked up in the text layer of profile.label_pages (no rendering).
+    If any is found, only the ROIs next to them are rendered and checked;
+    otherwise profile.fallback_pages are scanned whole.
+
+    stop_at_first_found=True: for callers that only need overall_status.
+    Stops after the first page with a confirmed signature; pages after it
+    are left out of "pages" and report["stopped_early"] is set.
+
+    report["timings_ms"] has the wall time of each stage (open, text, render,
+    clean, components, text_overlap) and the total. Pages scanned in worker
+    processes add their own stage times, so stages can sum to more than total.
+
+    The report is assembled from iter_checker's events.
+    """
+    report: Dict[str, Any] = {}
+    events = iter_checker(
+        profile, source, filename=filename, stop_at_first_found=stop_at_first_found, artifacts=artifacts
+    )
+    for event in events:
+        kind = event.pop("event")
+        if kind == "start":
+            report.update(event, overall_status="NOT_FOUND", pages=[])
+        elif kind == "page":
+            report["pages"].append(event)
+        else:
+            report.update(event)
+
+    if artifacts is not None:
+        report["debug"] = {"files": artifacts.names, "omitted": artifacts.omitted}
+    return report
+
+
+def run_checker_debug_bundle(
+    profile: CheckerProfile,
+    source: PdfSource,
+    filename: Optional[str] = None,
+    stop_at_first_found: bool = False,
+    max_masks: int = DEBUG_MAX_MASKS,
+) -> bytes:
+    """Run the checker with debug output. Returns a ZIP of report.json and the masks (PNG)."""
+    artifacts = DebugArtifacts(max_masks)
+    report = run_checker(
+        profile, source, filename=filename, stop_at_first_found=stop_at_first_found, artifacts=artifacts
+    )
+    return artifacts.to_zip(report)
@@ -1,4 +1,5 @@
 from app.core.database import get_db_connection
+from app.core.cache import invalidate
 from app.models import Course
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
@@ -10,21 +11,73 @@ class CourseUpdate(BaseModel):
     skills: List[str]
 
 
+def _attach_course_relations(
+    cursor,
+    courses: List[Dict[str, Any]],
+    skills: bool = True,
+    professors: bool = False,
+    assigned_tas: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Batch loader for course views.
+    Fills course["skills"], course["professors"] and course["assignedTAs"]
+    for every course in `courses` with ONE `IN (...)` query per relation,
+    so callers run a constant number of queries regardless of catalog size.
+    """
+    if not courses:
+        return courses
+
+    course_ids = [c["course_id"] for c in courses]
+    placeholders = ",".join(["%s"] * len(course_ids))
+
+    if skills:
+        cursor.execute(f"""
+            SELECT course_id, skill
+            FROM course_skill
+            WHERE course_id IN ({placeholders})
+        """, course_ids)
+        skill_map: Dict[int, List[str]] = {}
+        for r in cursor.fetchall():
+            skill_map.setdefault(r["course_id"], []).append(r["skill"])
+        for c in courses:
+            c["skills"] = skill_map.get(c["course_id"], [])
+
+    if professors:
+        cursor.execute(f"""
+            SELECT cp.course_id, p.name
+            FROM course_professor cp
+            JOIN professor p ON cp.professor_id = p.professor_id
+            WHERE cp.course_id IN ({placeholders})
+        """, course_ids)
+        prof_map: Dict[int, List[str]] = {}
+        for r in cursor.fetchall():
+            prof_map.setdefault(r["course_id"], []).append(r["name"])
+        for c in courses:
+            c["professors"] = prof_map.get(c["course_id"], [])
+
+    if assigned_tas:
+        cursor.execute(f"""
+            SELECT ta_assignment.course_id, ta.name
+            FROM ta_assignment
+            JOIN ta ON ta_assignment.ta_id = ta.ta_id
+            WHERE ta_assignment.course_id IN ({placeholders})
+        """, course_ids)
+        ta_map: Dict[int, List[str]] = {}
+        for r in cursor.fetchall():
+            ta_map.setdefault(r["course_id"], []).append(r["name"])
+        for c in courses:
+            c["assignedTAs"] = ta_map.get(c["course_id"], [])
+
+    return courses
+
+
 def get_courses() -> list[Course]:
     with get_db_connection() as conn:
         cursor = conn.cursor(dictionary=True)
         cursor.execute("SELECT * FROM course")
         results = cursor.fetchall()
 
-        for course in results:
-            cursor.execute(
-                "SELECT skill FROM course_skill WHERE course_id = %s",
-                (course["course_id"],)
-            )
-            skill_rows = cursor.fetchall()
-            course["skills"] = [row["skill"] for row in skill_rows]
-
-        return results
+        return _attach_course_relations(cursor, results, skills=True)
     
 from app.core.database import get_db_connection
 from app.models import Course  # assuming Course model exists
@@ -63,29 +116,8 @@ def get_courses_by_professor_username(username: str) -> list[dict]:
     )
     courses = cursor.fetchall()
 
-    for course in courses:
-        course_id = course["course_id"]
-
-        # Step 3: Assigned TAs
-        cursor.execute(
-            """
-            SELECT ta.ta_id, ta.name
-            FROM ta_assignment
-            JOIN ta ON ta_assignment.ta_id = ta.ta_id
-            WHERE ta_assignment.course_id = %s
-            """,
-            (course_id,)
-        )
-        assigned_rows = cursor.fetchall()
-        course["assignedTAs"] = [row["name"] for row in assigned_rows]
-
-        # Step 4: Course skills
-        cursor.execute(
-            "SELECT skill FROM course_skill WHERE course_id = %s",
-            (course_id,)
-        )
-        skill_rows = cursor.fetchall()
-        course["skills"] = [row["skill"] for row in skill_rows]
+    # Step 3: Assigned TAs + course skills (batched for all courses)
+    _attach_course_relations(cursor, courses, skills=True, assigned_tas=True)
 
     cursor.close()
     conn.close()
@@ -124,6 +156,7 @@ def update_course_in_db(data: CourseUpdate):
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate("skills", "courses")
 
         return {"message": "Course updated successfully"}
 
@@ -176,6 +209,7 @@ def create_course_with_professor(course_code: str, username: str, num_tas_reques
     conn.commit()
     cursor.close()
     conn.close()
+    invalidate("skills", "courses")
     return course_id
 
 
@@ -223,6 +257,7 @@ def remove_course_from_professor_and_delete_if_orphan(course_id: int, username:
             deleted_course = True
 
         conn.commit()
+        invalidate("skills", "courses", "assignments")
         return {
             "message": "Removed course successfully",
             "course_code": course_code,
@@ -253,30 +288,8 @@ def get_course_details(course_id: int) -> Optional[Dict[str, Any]]:
         conn.close()
         return None
 
-    # Professors
-    cursor.execute("""
-        SELECT p.name
-        FROM course_professor cp
-        JOIN professor p ON cp.professor_id = p.professor_id
-        WHERE cp.course_id = %s
-    """, (course_id,))
-    prof_rows = cursor.fetchall()
-    course["professors"] = [r["name"] for r in prof_rows]
-
-    # Assigned TAs (names)
-    cursor.execute("""
-        SELECT ta.name
-        FROM ta_assignment
-        JOIN ta ON ta_assignment.ta_id = ta.ta_id
-        WHERE ta_assignment.course_id = %s
-    """, (course_id,))
-    ta_rows = cursor.fetchall()
-    course["assignedTAs"] = [r["name"] for r in ta_rows]
-
-    # Skills
-    cursor.execute("SELECT skill FROM course_skill WHERE course_id = %s", (course_id,))
-    skill_rows = cursor.fetchall()
-    course["skills"] = [r["skill"] for r in skill_rows]
+    # Professors, assigned TAs (names) and skills
+    _attach_course_relations(cursor, [course], skills=True, professors=True, assigned_tas=True)
 
     cursor.close()
     conn.close()
@@ -303,46 +316,20 @@ def get_courses_by_ta_username(username: str) -> list[dict]:
     cursor.execute("""
         SELECT
             c.course_id, c.course_code, c.ps_lab_sections, c.enrollment_capacity,
-            c.actual_enrollment, c.num_tas_requested, c.assigned_tas_count,
-            GROUP_CONCAT(DISTINCT p.name SEPARATOR ', ') AS professor_name
+            c.actual_enrollment, c.num_tas_requested, c.assigned_tas_count
         FROM ta_assignment a
         JOIN course c ON a.course_id = c.course_id
-        LEFT JOIN course_professor cp ON cp.course_id = c.course_id
-        LEFT JOIN professor p ON p.professor_id = cp.professor_id
         WHERE a.ta_id = %s
-        GROUP BY c.course_id
     """, (ta_id,))
     courses = cursor.fetchall()
 
-    for course in courses:
-        cid = course["course_id"]
-
-        # Skills
-        cursor.execute("SELECT skill FROM course_skill WHERE course_id=%s", (cid,))
-        skill_rows = cursor.fetchall()
-        course["skills"] = [r["skill"] for r in skill_rows]
-
-        # Assigned TAs (names) for that course
-        cursor.execute("""
-            SELECT ta.name
-            FROM ta_assignment
-            JOIN ta ON ta_assignment.ta_id = ta.ta_id
-            WHERE ta_assignment.course_id = %s
-        """, (cid,))
-        assigned_rows = cursor.fetchall()
-        course["assignedTAs"] = [r["name"] for r in assigned_rows]
+    # Skills, assigned TAs (names) and professors for all courses at once
+    _attach_course_relations(cursor, courses, skills=True, professors=True, assigned_tas=True)
 
+    for course in courses:
         # Professor name (first professor if multiple)
-        cursor.execute("""
-            SELECT p.name
-            FROM course_professor cp
-            JOIN professor p ON cp.professor_id = p.professor_id
-            WHERE cp.course_id = %s
-            LIMIT 1
-        """, (cid,))
-        prow = cursor.fetchone()
-        course["professor_name"] = prow["name"] if prow else None
-
+        profs = course.pop("professors")
+        course["professor_name"] = profs[0] if profs else None
 
     cursor.close()
     conn.close()
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Tuple, Optional, Set
 from openpyxl import load_workbook
 
 from app.core.database import get_db_connection
+from app.core.cache import invalidate_all
 
 
 # -------------------------
@@ -487,6 +488,7 @@ def import_comp_excel(file_bytes: bytes) -> Dict[str, Any]:
             )
 
         conn.commit()
+        invalidate_all()
 
         # keep response light if lists are huge
         def cap(lst: List[str], n: int = 300) -> List[str]:
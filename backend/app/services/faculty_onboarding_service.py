@@ -2,6 +2,7 @@ from app.core.database import get_db_connection
 
 from app.models import FacultyOnboardingRequest
 from app.core.database import get_db_connection
+from app.core.cache import invalidate
 
 def onboard_faculty(data: FacultyOnboardingRequest):
     conn = get_db_connection()
@@ -45,6 +46,7 @@ def onboard_faculty(data: FacultyOnboardingRequest):
         )
 
         conn.commit()
+        invalidate("professors")
         return professor_id
 
     except Exception:
@@ -1,44 +1,112 @@
 from app.core.database import get_db_connection
-from typing import Optional, List
+from app.core.cache import cached, invalidate
+from typing import Optional, List, Dict, Any
+
+# Columns returned for each preferred TA.
+# Algorithm callers only need ids + names; the UI also shows program/level/hours.
+PREFERRED_TA_SUMMARY_COLUMNS = ["t.ta_id", "t.name"]
+PREFERRED_TA_DETAIL_COLUMNS = ["t.ta_id", "t.name", "t.program", "t.level", "t.max_hours"]
+
+
+@cached("professors")
+def get_all_professors(
+    include_ta_details: bool = True,
+    limit: Optional[int] = None,
+    after_name: Optional[str] = None,
+    after_id: Optional[int] = None,
+):
+    """
+    Return professors ordered by (name, professor_id), each with "preferred_tas".
+
+    Runs exactly two queries (professors, then all their preferred TAs in one
+    IN (...) batch) instead of one preferred-TA query per professor.
+
+    - include_ta_details=False: preferred TAs only carry ta_id + name
+    - limit / after_name / after_id: keyset pagination; pass the name and id of
+      the last professor of the previous page to get the next one
+    """
+    if (after_name is None) != (after_id is None):
+        raise ValueError("after_name and after_id must be given together")
 
-def get_all_professors():
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
 
-    query = """
+    where = ""
+    params: List[Any] = []
+    if after_name is not None and after_id is not None:
+        where = "WHERE name > %s OR (name = %s AND professor_id > %s)"
+        params += [after_name, after_name, after_id]
+
+    query = f"""
         SELECT 
             professor_id,
             name
         FROM professor
-        ORDER BY name ASC;
+        {where}
+        ORDER BY name ASC, professor_id ASC
     """
-    cursor.execute(query)
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    cursor.execute(query, params)
     professors = cursor.fetchall()
 
-    # Get preferred TAs for each professor
-    pref_query = """
+    if not professors:
+        cursor.close()
+        conn.close()
+        return []
+
+    # Preferred TAs for all professors on this page
+    prof_ids = [p["professor_id"] for p in professors]
+    columns = PREFERRED_TA_DETAIL_COLUMNS if include_ta_details else PREFERRED_TA_SUMMARY_COLUMNS
+    pref_query = f"""
         SELECT 
-            t.ta_id,
-            t.name,
-            t.program,
-            t.level,
-            t.max_hours
+            ppt.professor_id AS pref_professor_id,
+            {", ".join(columns)}
         FROM professor_preferred_ta ppt
         JOIN ta t 
             ON ppt.ta_id = t.ta_id
-        WHERE ppt.professor_id = %s;
+        WHERE ppt.professor_id IN ({",".join(["%s"] * len(prof_ids))});
     """
+    cursor.execute(pref_query, prof_ids)
+
+    pref_map: Dict[int, List[Dict[str, Any]]] = {}
+    for row in cursor.fetchall():
+        pid = row.pop("pref_professor_id")
+        pref_map.setdefault(pid, []).append(row)
 
     for prof in professors:
-        cursor.execute(pref_query, (prof["professor_id"],))
-        preferred_tas = cursor.fetchall()
-        prof["preferred_tas"] = preferred_tas
+        prof["preferred_tas"] = pref_map.get(prof["professor_id"], [])
 
     cursor.close()
     conn.close()
 
     return professors
 
+
+def get_professors_page(limit: int, after_name: Optional[str] = None, after_id: Optional[int] = None):
+    """
+    Keyset-paginated professor listing for the UI.
+    Returns { "professors": [...], "next_after_name": ..., "next_after_id": ... }
+    where the next_* values are None on the last page.
+    """
+    # one extra row tells whether another page follows
+    rows = get_all_professors(
+        include_ta_details=True,
+        limit=limit + 1,
+        after_name=after_name,
+        after_id=after_id,
+    )
+    professors = rows[:limit]
+    has_more = len(rows) > limit
+    last = professors[-1] if has_more else None
+    return {
+        "professors": professors,
+        "next_after_name": last["name"] if last else None,
+        "next_after_id": last["professor_id"] if last else None,
+    }
+
 def get_professor_by_id(professor_id: int):
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
@@ -99,3 +167,6 @@ def update_professor(professor_id: int, name: Optional[str], preferred_ta_ids: L
     finally:
         cursor.close()
         conn.close()
+
+    # professor names also appear in TAs' preferred professor lists
+    invalidate("professors", "tas")
@@ -1,5 +1,6 @@
 from datetime import datetime
 from app.core.database import get_db_connection
+from app.core.cache import invalidate
 
 def finish_registration(registration_token: str, data: dict):
     """
@@ -111,6 +112,7 @@ def finish_registration(registration_token: str, data: dict):
         cursor.execute("DELETE FROM pending_registration WHERE pending_id=%s", (pending_id,))
 
         conn.commit()
+        invalidate("tas", "skills", "professors")
 
         return {
             "message": "Registration completed",
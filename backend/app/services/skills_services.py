@@ -1,5 +1,7 @@
 from app.core.database import get_db_connection
+from app.core.cache import cached
 
+@cached("skills")
 def get_all_skills():
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
@@ -1,4 +1,5 @@
 from app.core.database import get_db_connection
+from app.core.cache import invalidate
 
 def onboard_ta(data):
     """
@@ -61,6 +62,7 @@ def onboard_ta(data):
         )
 
         conn.commit()
+        invalidate("tas", "skills")
         return ta_id
 
     except Exception:
@@ -1,5 +1,7 @@
 from app.core.database import get_db_connection
+from app.core.cache import cached, invalidate
 
+@cached("tas")
 def get_all_tas():
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
@@ -196,3 +198,6 @@ def update_ta(
     finally:
         cursor.close()
         conn.close()
+
+    # TA names also appear in professors' preferred TA lists
+    invalidate("tas", "skills", "professors")
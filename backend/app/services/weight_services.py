@@ -1,6 +1,8 @@
 from app.core.database import get_db_connection
+from app.core.cache import cached, invalidate
 from app.models import Weights
 
+@cached("weights")
 def get_weights() -> Weights:
     with get_db_connection() as conn:
         cursor = conn.cursor(dictionary=True)  # dictionary=True to get column names
@@ -27,3 +29,4 @@ def update_weights(weights: Weights):
         )
         conn.commit()
         cursor.close()
+    invalidate("weights")
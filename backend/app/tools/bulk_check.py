@@ -0,0 +1,236 @@
+"""
+Check every PDF under a directory offline, e.g. a whole semester's archive.
+
+Usage (from backend/):
+    python -m app.tools.bulk_check path/to/pdfs --kind comp590 --out results.jsonl [--workers 4]
+
+Files are spread over a process pool (one file per job). Every result is
+appended to the JSONL output as soon as it finishes, one line per file:
+    {"file": "sub/a.pdf", "kind": "comp590", "version": "7", "ok": true, "seconds": 0.41, "report": {...}}
+    {"file": "sub/b.pdf", "kind": "comp590", "version": "7", "ok": false, "seconds": 0.02, "error": "..."}
+
+The run is resumable: files that already have an "ok" line for the same
+checker kind and version in the output are skipped, so an interrupted run
+is restarted with the same command. Failed files are retried (the last
+line of a file wins).
+
+At the end, throughput (files/s, pages/s) and the p50/p95 per-file
+latency of this run are printed.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set
+
+from app.services import checker_engine, internship_report_checker, signaturechecker
+from app.services.checker_engine import CheckerProfile
+
+PROFILES: Dict[str, CheckerProfile] = {
+    p.name: p for p in (signaturechecker.PROFILE, internship_report_checker.PROFILE)
+}
+
+# jobs queued per worker, so the pool never waits on the main process
+QUEUE_PER_WORKER = 2
+# recycle worker processes now and then (pdfium/OpenCV memory over long runs)
+MAX_TASKS_PER_CHILD = 200
+
+
+def find_pdfs(directory: str) -> List[str]:
+    """Paths of all PDFs under directory, relative to it, in a stable order."""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".pdf") and not name.startswith("._"):
+                found.append(os.path.relpath(os.path.join(root, name), directory))
+    return found
+
+
+def load_done(out_path: str, profile: CheckerProfile) -> Set[str]:
+    """Files with a successful result for this checker kind and version in out_path."""
+    done: Set[str] = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # last line cut short by an interrupted run
+                continue
+            if entry.get("kind") != profile.name or entry.get("version") != profile.version:
+                continue
+            if entry.get("ok"):
+                done.add(entry["file"])
+            else:
+                done.discard(entry["file"])
+    return done
+
+
+def _init_worker() -> None:
+    # files are already checked in parallel; no nested page pool per file
+    checker_engine.FALLBACK_MAX_WORKERS = 1
+
+
+def check_file(kind: str, directory: str, rel_path: str) -> Dict[str, Any]:
+    """Run one checker on one file. Never raises: errors become an "ok": false line."""
+    profile = PROFILES[kind]
+    line: Dict[str, Any] = {"file": rel_path, "kind": kind, "version": profile.version}
+    t0 = time.perf_counter()
+    try:
+        report = checker_engine.run_checker(profile, os.path.join(directory, rel_path), filename=rel_path)
+        line.update(ok=True, report=report)
+    except Exception as e:
+        line.update(ok=False, error=f"{type(e).__name__}: {e}")
+    line["seconds"] = round(time.perf_counter() - t0, 4)
+    return line
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(q / 100.0 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def run(directory: str, kind: str, out_path: str, workers: int, limit: Optional[int] = None) -> int:
+    """Check the pending files of directory; returns the number of failures."""
+    profile = PROFILES[kind]
+    files = find_pdfs(directory)
+    done = load_done(out_path, profile)
+    todo = [f for f in files if f not in done]
+    print(f"{len(files)} PDFs found, {len(files) - len(todo)} already done, "
+          f"{len(todo)} to check with {workers} worker(s)")
+    if limit is not None:
+        todo = todo[:limit]
+
+    latencies: List[float] = []
+    pages = failed = 0
+    t_start = time.perf_counter()
+
+    # an interrupted run may have left a partial last line
+    needs_newline = os.path.exists(out_path) and os.path.getsize(out_path) > 0
+    if needs_newline:
+        with open(out_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+
+    with open(out_path, "a", encoding="utf-8") as out:
+        if needs_newline:
+            out.write("\n")
+
+        def record(line: Dict[str, Any]) -> None:
+            nonlocal pages, failed
+            out.write(json.dumps(line) + "\n")
+            out.flush()
+            latencies.append(line["seconds"])
+            if line["ok"]:
+                pages += line["report"]["page_count"]
+            else:
+                failed += 1
+                print(f"FAILED {line['file']}: {line['error']}")
+            n = len(latencies)
+            if n % 100 == 0 or n == len(todo):
+                rate = n / max(time.perf_counter() - t_start, 1e-9)
+                print(f"  {n}/{len(todo)} files ({rate:.1f} files/s)")
+
+        try:
+            if workers <= 1:
+                _init_worker()
+                for rel_path in todo:
+                    record(check_file(kind, directory, rel_path))
+            else:
+                _run_pool(kind, directory, todo, workers, record)
+        except KeyboardInterrupt:
+            print("Interrupted; finished results are saved, rerun the same command to resume.")
+
+    elapsed = time.perf_counter() - t_start
+    if latencies:
+        print(f"checked {len(latencies)} files ({pages} pages, {failed} failed) in {elapsed:.1f}s: "
+              f"{len(latencies) / elapsed:.2f} files/s, {pages / elapsed:.2f} pages/s")
+        print(f"per-file latency: p50 {percentile(latencies, 50):.3f}s  "
+              f"p95 {percentile(latencies, 95):.3f}s  max {max(latencies):.3f}s")
+    return failed
+
+
+def _new_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn: same start method as the server's checker pool (app/core/checker_pool.py)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        max_tasks_per_child=MAX_TASKS_PER_CHILD,
+    )
+
+
+def _run_pool(kind: str, directory: str, todo: List[str], workers: int, record) -> None:
+    """
+    A worker dying mid-file (segfault in a native library, OOM kill) breaks
+    the whole pool: every file in flight then gets an "ok": false line (a
+    rerun retries them) and the run goes on with a fresh pool.
+    """
+    pool = _new_pool(workers)
+    pending = iter(todo)
+    running = {}  # future -> (rel_path, submit time)
+    try:
+        while True:
+            while len(running) < workers * QUEUE_PER_WORKER:
+                rel_path = next(pending, None)
+                if rel_path is None:
+                    break
+                running[pool.submit(check_file, kind, directory, rel_path)] = (rel_path, time.perf_counter())
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in finished:
+                broken |= _collect(future, running.pop(future), kind, record)
+            if broken:
+                # the rest of the broken pool's futures finish (mostly failing) right away
+                finished, _ = wait(running)
+                for future in finished:
+                    _collect(future, running.pop(future), kind, record)
+                pool.shutdown(wait=True, cancel_futures=True)
+                print("A worker process died; continuing with a new pool.")
+                pool = _new_pool(workers)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _collect(future, job, kind: str, record) -> bool:
+    """Record a finished job; returns True when its worker process died."""
+    rel_path, t0 = job
+    try:
+        record(future.result())
+        return False
+    except BrokenProcessPool as e:
+        record({"file": rel_path, "kind": kind, "version": PROFILES[kind].version, "ok": False,
+                "seconds": round(time.perf_counter() - t0, 4), "error": f"BrokenProcessPool: {e}"})
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    parser.add_argument("--kind", choices=sorted(PROFILES), required=True)
+    parser.add_argument("--out", required=True, help="JSONL results file (appended to, resumable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--limit", type=int, default=None, help="check at most this many pending files")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"not a directory: {args.directory}")
+
+    failed = run(args.directory, args.kind, args.out, args.workers, args.limit)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
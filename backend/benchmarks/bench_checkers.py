@@ -0,0 +1,109 @@
+"""
+Accuracy and throughput of both PDF checkers on a labeled corpus
+(see make_corpus.py), across analysis DPIs and fallback worker counts.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/make_corpus.py /tmp/corpus
+    PYTHONPATH=. python benchmarks/bench_checkers.py /tmp/corpus [--dpi 150 220] [--workers 1 2]
+
+The directory needs a truth.json ({"file.pdf": true/false, ...}, true =
+signed). For every (checker, DPI, workers) setting, each PDF is checked
+once in this process and the table shows precision/recall of FOUND
+against truth.json, pages/s and files/s. The per-kind columns give the
+recall by file-name prefix (form_, report_, scan_), which shows
+e.g. that comp291-391 cannot see scans (it has no fallback scan).
+
+--workers sets checker_engine.FALLBACK_MAX_WORKERS: the number of
+processes a long fallback scan is split across.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from app.services import checker_engine, internship_report_checker, signaturechecker
+
+PROFILES = [signaturechecker.PROFILE, internship_report_checker.PROFILE]
+
+
+def set_fallback_workers(n: int) -> None:
+    """Resize the engine's fallback pool (it is created once, on first use)."""
+    if checker_engine._fallback_pool is not None:
+        checker_engine._fallback_pool.shutdown(wait=True)
+        checker_engine._fallback_pool = None
+    checker_engine.FALLBACK_MAX_WORKERS = n
+
+
+def ratio(a: int, b: int) -> str:
+    return f"{a / b:.2f}" if b else "  - "
+
+
+def bench(profile, directory: str, pdfs: List[str], truth: Dict[str, bool]) -> Dict[str, str]:
+    tp = fp = fn = tn = 0
+    pages = 0
+    per_kind = defaultdict(lambda: [0, 0])  # prefix -> [signed found, signed]
+    t0 = time.perf_counter()
+    for name in pdfs:
+        report = checker_engine.run_checker(profile, os.path.join(directory, name))
+        pages += report["page_count"]
+        found = report["overall_status"] == "FOUND"
+        signed = truth[name]
+        tp += found and signed
+        fp += found and not signed
+        fn += signed and not found
+        tn += not signed and not found
+        if signed:
+            kind = per_kind[name.split("_", 1)[0]]
+            kind[0] += found
+            kind[1] += 1
+    elapsed = time.perf_counter() - t0
+
+    row = {
+        "precision": ratio(tp, tp + fp),
+        "recall": ratio(tp, tp + fn),
+        "accuracy": ratio(tp + tn, len(pdfs)),
+        "pages/s": f"{pages / elapsed:.1f}",
+        "files/s": f"{len(pdfs) / elapsed:.2f}",
+    }
+    for kind, (hit, total) in sorted(per_kind.items()):
+        row[f"rec {kind}"] = ratio(hit, total)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    parser.add_argument("--dpi", type=int, nargs="+", default=[150, 220])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, min(4, os.cpu_count() or 1)])
+    parser.add_argument("--fixed-dpi", action="store_true", help="disable the coarse-to-fine DPI pass")
+    args = parser.parse_args()
+
+    with open(os.path.join(args.directory, "truth.json")) as f:
+        truth = json.load(f)
+    pdfs = sorted(name for name in truth if os.path.exists(os.path.join(args.directory, name)))
+    print(f"{len(pdfs)} labeled PDFs ({sum(truth[n] for n in pdfs)} signed)")
+
+    rows = []
+    for workers in sorted(set(args.workers)):
+        set_fallback_workers(workers)
+        for dpi in args.dpi:
+            for profile in PROFILES:
+                tuned = profile.model_copy(update={"dpi": dpi, "adaptive_dpi": profile.adaptive_dpi and not args.fixed_dpi})
+                # warm-up: imports, pool start-up, regex compilation
+                checker_engine.run_checker(tuned, os.path.join(args.directory, pdfs[0]))
+                rows.append({"checker": profile.name, "dpi": str(dpi), "workers": str(workers),
+                             **bench(tuned, args.directory, pdfs, truth)})
+    set_fallback_workers(1)
+
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    widths = {c: max(len(c), *(len(row.get(c, "")) for row in rows)) for c in columns}
+    print("  ".join(c.rjust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(row.get(c, "").rjust(widths[c]) for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare the old per-component Python loop of _component_candidates with the
+vectorized checker_common.component_candidates on real page masks.
+
+Labeling (cv2.connectedComponentsWithStats) is the same for both, so the
+filter/top-k stage is timed on its own, from the same stats array.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_components.py file.pdf [--dpi 220] [--repeat 20]
+
+Each page is rendered and binarized like the fallback scan; both
+implementations then run on the same mask. Their outputs are asserted
+equal, and the average time per page is printed with the component count.
+"""
+
+import argparse
+import time
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+
+from app.services.checker_common import candidates_from_stats, component_candidates, render_page_gray
+from app.services.checker_engine import _binarize, _despeckle, _remove_table_lines
+from app.services.signaturechecker import PROFILE
+
+MIN_BBOX_AREA = PROFILE.min_bbox_area
+MAX_BBOX_AREA = PROFILE.max_bbox_area
+MAX_KEEP_PER_PAGE_FALLBACK = PROFILE.max_keep_per_page_fallback
+
+
+def loop_candidates(mask: np.ndarray, max_keep: int) -> List[Tuple[float, int, int, int, int]]:
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    return loop_from_stats(stats, max_keep)
+
+
+def loop_from_stats(stats: np.ndarray, max_keep: int) -> List[Tuple[float, int, int, int, int]]:
+    """The filter both checkers used before (one Python iteration per component)."""
+    num = len(stats)
+    cands = []
+    for i in range(1, num):
+        x, y, w, h, area = stats[i]
+        bbox_area = w * h
+        if bbox_area <= 0:
+            continue
+        if area < MIN_BBOX_AREA or area > MAX_BBOX_AREA:
+            continue
+        fill = area / float(bbox_area)
+        if fill > 0.75:
+            continue
+        score = float(area) * float(fill)
+        cands.append((score, int(x), int(y), int(w), int(h)))
+    cands.sort(key=lambda t: t[0], reverse=True)
+    return cands[:max_keep]
+
+
+def timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf")
+    parser.add_argument("--dpi", type=int, default=220)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--keep", type=int, default=MAX_KEEP_PER_PAGE_FALLBACK)
+    args = parser.parse_args()
+
+    pdf = pdfium.PdfDocument(args.pdf)
+    t_loop = t_vec = 0.0
+    print(f"{'page':>4} {'components':>10} {'loop ms':>8} {'numpy ms':>9}")
+    for pidx in range(len(pdf)):
+        gray = render_page_gray(pdf[pidx], args.dpi / 72.0)
+        # the line-free mask before despeckling is the densest realistic input
+        mask = _remove_table_lines(_binarize(gray, args.dpi), args.dpi)
+        for name, m in (("raw", mask), ("clean", _despeckle(mask, args.dpi))):
+            expected = loop_candidates(m, args.keep)
+            got = component_candidates(m, args.keep, MIN_BBOX_AREA, MAX_BBOX_AREA)
+            assert expected == got, (pidx, name, expected, got)
+
+        num, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        t_label = timed(lambda: cv2.connectedComponentsWithStats(mask, connectivity=8), args.repeat)
+        a = timed(lambda: loop_from_stats(stats, args.keep), args.repeat)
+        b = timed(lambda: candidates_from_stats(stats[1:], args.keep, MIN_BBOX_AREA, MAX_BBOX_AREA), args.repeat)
+        t_loop += a
+        t_vec += b
+        print(f"{pidx + 1:>4} {num - 1:>10} {a * 1000:>8.2f} {b * 1000:>9.2f}   (labeling {t_label * 1000:.1f} ms)")
+
+    print(f"filter stage total: loop {t_loop * 1000:.1f} ms, numpy {t_vec * 1000:.1f} ms, "
+          f"speedup {t_loop / max(t_vec, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare the old page render path (RGB(A) render -> BGR -> GRAY) with the
+direct grayscale render used by the checkers.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_render.py file1.pdf [file2.pdf ...] [--dpi 220]
+
+For every page both paths are run under tracemalloc; the report shows the
+peak traced memory per page and the wall time. ctypes bitmap buffers and
+NumPy arrays are both traced, so the peak reflects the full-page copies.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+
+from app.services.checker_common import render_page_gray
+
+
+def render_legacy(page: pdfium.PdfPage, scale: float) -> np.ndarray:
+    """The render path the checkers used before: RGB(A) -> BGR -> GRAY."""
+    img = page.render(scale=scale).to_numpy()
+    if img.shape[2] == 4:
+        img = img[:, :, :3]
+    bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+
+
+def measure(fn, page: pdfium.PdfPage, scale: float):
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    t0 = time.perf_counter()
+    gray = fn(page, scale)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    return gray.shape, peak - base, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("--dpi", type=int, default=220)
+    args = parser.parse_args()
+
+    scale = args.dpi / 72.0
+    totals = {"legacy": [0, 0.0], "gray": [0, 0.0]}
+    pages = 0
+
+    tracemalloc.start()
+    for path in args.pdfs:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            for pidx in range(len(pdf)):
+                page = pdf[pidx]
+                shape_l, peak_l, t_l = measure(render_legacy, page, scale)
+                shape_g, peak_g, t_g = measure(render_page_gray, page, scale)
+                assert shape_l == shape_g, (shape_l, shape_g)
+                totals["legacy"][0] += peak_l
+                totals["legacy"][1] += t_l
+                totals["gray"][0] += peak_g
+                totals["gray"][1] += t_g
+                pages += 1
+        finally:
+            pdf.close()
+    tracemalloc.stop()
+
+    if not pages:
+        print("no pages")
+        return
+
+    print(f"{pages} page(s) at {args.dpi} DPI")
+    print(f"{'path':<8} {'peak MB/page':>13} {'ms/page':>9}")
+    for name, (peak, secs) in totals.items():
+        print(f"{name:<8} {peak / pages / 1e6:>13.2f} {secs / pages * 1000:>9.1f}")
+    ratio = totals["legacy"][0] / max(1, totals["gray"][0])
+    print(f"peak memory reduction: {ratio:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
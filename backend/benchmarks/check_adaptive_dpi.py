@@ -0,0 +1,93 @@
+"""
+Accuracy guard for the coarse-to-fine DPI path of the PDF checkers.
+
+Runs both checkers on every PDF of a directory twice, once at the fixed
+DPI only and once adaptive (coarse pass + escalation), and compares the
+overall and per-page statuses. With a truth.json next to the PDFs
+({"file.pdf": true/false, ...}, true = signed) the accuracy of both runs
+against it is printed as well.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/check_adaptive_dpi.py path/to/pdfs
+
+tests/test_adaptive_dpi.py runs the same comparison under pytest on a
+small generated corpus.
+
+Exits with status 1 when the adaptive run disagrees with the fixed run.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from app.services import checker_engine, internship_report_checker, signaturechecker
+
+PROFILES = [signaturechecker.PROFILE, internship_report_checker.PROFILE]
+
+
+def run(profile, path: str, adaptive: bool):
+    profile = profile.model_copy(update={"adaptive_dpi": adaptive})
+    t0 = time.perf_counter()
+    report = checker_engine.run_checker(profile, path)
+    return report, time.perf_counter() - t0
+
+
+def page_statuses(report):
+    return [p["page_status"] for p in report["pages"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    args = parser.parse_args()
+
+    # keep the fallback scan in this process (timings comparable)
+    checker_engine.FALLBACK_MAX_WORKERS = 1
+
+    pdfs = sorted(f for f in os.listdir(args.directory) if f.lower().endswith(".pdf"))
+    truth_path = os.path.join(args.directory, "truth.json")
+    truth = json.load(open(truth_path)) if os.path.exists(truth_path) else {}
+
+    mismatches = 0
+    for profile in PROFILES:
+        kind = profile.name
+        fixed_t = adaptive_t = 0.0
+        correct = {"fixed": 0, "adaptive": 0}
+        coarse_only = 0
+        pages = 0
+        for name in pdfs:
+            path = os.path.join(args.directory, name)
+            fixed, t_f = run(profile, path, adaptive=False)
+            adaptive, t_a = run(profile, path, adaptive=True)
+            fixed_t += t_f
+            adaptive_t += t_a
+            pages += len(adaptive["pages"])
+            coarse_only += sum(1 for p in adaptive["pages"] if p.get("dpi") == profile.coarse_dpi)
+
+            if (fixed["overall_status"] != adaptive["overall_status"]
+                    or page_statuses(fixed) != page_statuses(adaptive)):
+                mismatches += 1
+                print(f"MISMATCH {kind} {name}: fixed={fixed['overall_status']} "
+                      f"adaptive={adaptive['overall_status']}")
+
+            if name in truth:
+                expected = "FOUND" if truth[name] else "NOT_FOUND"
+                correct["fixed"] += fixed["overall_status"] == expected
+                correct["adaptive"] += adaptive["overall_status"] == expected
+
+        print(f"{kind}: {len(pdfs)} files, {pages} pages, {coarse_only} decided at {profile.coarse_dpi} DPI")
+        print(f"  time fixed {fixed_t:.2f}s  adaptive {adaptive_t:.2f}s")
+        if truth:
+            n = sum(1 for name in pdfs if name in truth)
+            print(f"  accuracy vs truth.json: fixed {correct['fixed']}/{n}  adaptive {correct['adaptive']}/{n}")
+
+    if mismatches:
+        print(f"{mismatches} disagreement(s) between fixed and adaptive DPI")
+        sys.exit(1)
+    print("adaptive DPI matches fixed DPI on every file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Synthesize a labeled PDF corpus for the checker benchmarks.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/make_corpus.py path/to/out [--count 24] [--seed 0]
+
+Writes, deterministically for a given seed:
+  form_NN_{signed,blank}.pdf    typed evaluation forms with a "Supervisor Signature:"
+                                label on the first or last page, some with table lines
+  report_NN_{signed,blank}.pdf  multi-page internship reports (10-40 body pages,
+                                student + supervisor signature labels at the end)
+  scan_NN_{signed,blank}.pdf    forms/reports rasterized to one JPEG image per page
+                                (no text layer), with light scanner noise
+  truth.json                    {"file.pdf": true/false, ...}, true = signed
+
+"Signed" documents carry handwritten-like Bezier strokes next to the label;
+blank ones only have the printed signature line.
+"""
+
+import argparse
+import json
+import os
+import random
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+
+PAGE_W, PAGE_H = 612, 792
+WORDS = ["project", "work", "system", "data", "design", "team", "weekly", "task", "review", "result"]
+
+
+def _escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text(ops: List[str], x: float, y: float, s: str, size: int = 11) -> None:
+    ops.append(f"BT /F1 {size} Tf {x} {y} Td ({_escape(s)}) Tj ET")
+
+
+def _scribble(rng: random.Random, x: float, y: float, w: float, h: float) -> str:
+    """A handwritten-like signature: one pen stroke of random cubic Bezier segments."""
+    ops = [f"q 0.1 0.1 {rng.uniform(0.2, 0.6):.2f} RG {rng.uniform(1.0, 1.8):.1f} w 1 J 1 j"]
+    px, py = x, y + h * rng.uniform(0.3, 0.7)
+    ops.append(f"{px:.1f} {py:.1f} m")
+    for _ in range(rng.randint(5, 9)):
+        nx = min(x + w, px + rng.uniform(w * 0.08, w * 0.2))
+        ny = y + h * rng.uniform(0.1, 0.9)
+        c1 = (px + rng.uniform(-10, 20), y + h * rng.uniform(-0.2, 1.2))
+        c2 = (nx + rng.uniform(-20, 10), y + h * rng.uniform(-0.2, 1.2))
+        ops.append(f"{c1[0]:.1f} {c1[1]:.1f} {c2[0]:.1f} {c2[1]:.1f} {nx:.1f} {ny:.1f} c")
+        px, py = nx, ny
+    ops.append("S Q")
+    return "\n".join(ops)
+
+
+def _table(ops: List[str], y: float, rows: int = 6) -> float:
+    """Ruled table starting at y; returns the y below it."""
+    ops.append("0 0 0 RG 0.8 w")
+    for i in range(rows):
+        ops.append(f"60 {y - i * 20} m 552 {y - i * 20} l S")
+    for x in (60, 300, 552):
+        ops.append(f"{x} {y} m {x} {y - (rows - 1) * 20} l S")
+    return y - rows * 20 - 10
+
+
+def _signature_line(ops: List[str], rng: random.Random, y: float, label: str, signed: bool) -> None:
+    _text(ops, 72, y, label)
+    ops.append(f"0 0 0 RG 0.6 w 220 {y - 3} m 440 {y - 3} l S")
+    if signed:
+        ops.append(_scribble(rng, 230, y - 4, rng.uniform(120, 190), rng.uniform(18, 30)))
+
+
+def form_page(rng: random.Random, signed: bool, table: bool) -> str:
+    ops: List[str] = []
+    _text(ops, 72, 730, "COMP 590 Evaluation Form", 16)
+    y = 690
+    for _ in range(8):
+        _text(ops, 72, y, "Criterion: " + " ".join(rng.choice(["quality", "timeliness", "effort", "clarity"]) for _ in range(5)))
+        y -= 18
+    if table:
+        y = _table(ops, y)
+    _signature_line(ops, rng, y - 40, "Supervisor Signature:", signed)
+    _text(ops, 72, y - 100, "Date: 12/06/2025")
+    return "\n".join(ops)
+
+
+def body_page(rng: random.Random, table: bool) -> str:
+    ops: List[str] = []
+    _text(ops, 72, 720, f"Internship Report - Section {rng.randint(1, 9)}", 14)
+    y = 690
+    for _ in range(rng.randint(15, 30)):
+        _text(ops, 72, y, " ".join(rng.choice(WORDS) for _ in range(10)))
+        y -= 16
+    if table and y > 200:
+        _table(ops, y - 10)
+    return "\n".join(ops)
+
+
+def report_sign_page(rng: random.Random, signed: bool) -> str:
+    ops: List[str] = []
+    _text(ops, 72, 720, "Declaration", 14)
+    _text(ops, 72, 690, "I confirm that this report describes my own internship work.")
+    _signature_line(ops, rng, 620, "Student Signature:", signed)
+    _signature_line(ops, rng, 520, "Supervisor Signature:", signed)
+    return "\n".join(ops)
+
+
+def build_pdf(pages: List[Optional[str]], images: Optional[List[Tuple[bytes, int, int]]] = None) -> bytes:
+    """
+    Minimal PDF writer. pages: content streams; with images, page i shows
+    images[i] (JPEG bytes, width, height) full-page instead.
+    """
+    objs: List[Optional[bytes]] = []
+
+    def add(body: Optional[bytes]) -> int:
+        objs.append(body)
+        return len(objs)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_id = add(None)
+    kids = []
+    for i, content in enumerate(pages):
+        res = f"/Font << /F1 {font} 0 R >>"
+        if images is not None:
+            jpg, iw, ih = images[i]
+            img = add(
+                f"<< /Type /XObject /Subtype /Image /Width {iw} /Height {ih} /ColorSpace /DeviceGray "
+                f"/BitsPerComponent 8 /Filter /DCTDecode /Length {len(jpg)} >>\nstream\n".encode()
+                + jpg + b"\nendstream"
+            )
+            res += f" /XObject << /Im0 {img} 0 R >>"
+            content = f"q {PAGE_W} 0 0 {PAGE_H} 0 0 cm /Im0 Do Q"
+        data = zlib.compress((content or "").encode("latin-1"))
+        stream = add(f"<< /Length {len(data)} /Filter /FlateDecode >>\nstream\n".encode() + data + b"\nendstream")
+        kids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+            f"/Resources << {res} >> /Contents {stream} 0 R >>".encode()
+        ))
+    objs[pages_id - 1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode()
+    catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    out = bytearray(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for i, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def rasterize(pdf_bytes: bytes, rng: random.Random, dpi: int = 150, quality: int = 80) -> bytes:
+    """Scanned copy: every page becomes a noisy grayscale JPEG, no text layer."""
+    doc = pdfium.PdfDocument(pdf_bytes)
+    np_rng = np.random.default_rng(rng.randrange(2**32))
+    images = []
+    for page in doc:
+        gray = page.render(scale=dpi / 72.0, grayscale=True).to_numpy()
+        if gray.ndim == 3:
+            gray = gray[:, :, 0]
+        noisy = gray.astype(np.int16) - np_rng.integers(0, 12, gray.shape, dtype=np.int16)
+        ok, enc = cv2.imencode(".jpg", np.clip(noisy, 0, 255).astype(np.uint8), [cv2.IMWRITE_JPEG_QUALITY, quality])
+        images.append((enc.tobytes(), gray.shape[1], gray.shape[0]))
+    doc.close()
+    return build_pdf([None] * len(images), images)
+
+
+def make_form(rng: random.Random, signed: bool) -> bytes:
+    pages = rng.choice([1, 2, 3])
+    table = rng.random() < 0.5
+    # the signature block sits on the first or the last page (comp590 policy)
+    sign_at = rng.choice([0, pages - 1])
+    content = [
+        form_page(rng, signed, table) if i == sign_at else body_page(rng, table)
+        for i in range(pages)
+    ]
+    return build_pdf(content)
+
+
+def make_report(rng: random.Random, signed: bool) -> bytes:
+    body = rng.randint(10, 40)
+    table = rng.random() < 0.5
+    content = [body_page(rng, table and i % 4 == 0) for i in range(body)]
+    if rng.random() < 0.3:
+        content[rng.randrange(1, body)] = ""  # an empty page
+    content.append(report_sign_page(rng, signed))
+    return build_pdf(content)
+
+
+def write_corpus(out: str, count: int = 24, scans: Optional[int] = None, seed: int = 0) -> Dict[str, bool]:
+    """Write the corpus (see the module docstring) to out; returns its truth.json."""
+    os.makedirs(out, exist_ok=True)
+    rng = random.Random(seed)
+    n_scans = count // 2 if scans is None else scans
+    truth = {}
+
+    def write(name: str, data: bytes, signed: bool) -> None:
+        with open(os.path.join(out, name), "wb") as f:
+            f.write(data)
+        truth[name] = signed
+
+    sources = []
+    for i in range(count):
+        signed = i % 2 == 0
+        tag = "signed" if signed else "blank"
+        form = make_form(rng, signed)
+        report = make_report(rng, signed)
+        write(f"form_{i:02d}_{tag}.pdf", form, signed)
+        write(f"report_{i:02d}_{tag}.pdf", report, signed)
+        sources.append((form, signed))
+        sources.append((report, signed))
+
+    for i, (data, signed) in enumerate(sources[:n_scans]):
+        write(f"scan_{i:02d}_{'signed' if signed else 'blank'}.pdf", rasterize(data, rng), signed)
+
+    with open(os.path.join(out, "truth.json"), "w") as f:
+        json.dump(truth, f, indent=1, sort_keys=True)
+    return truth
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out")
+    parser.add_argument("--count", type=int, default=24, help="documents per kind (forms, reports)")
+    parser.add_argument("--scans", type=int, default=None, help="scanned copies (default: count // 2)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    truth = write_corpus(args.out, args.count, args.scans, args.seed)
+    print(f"{len(truth)} PDFs written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+The coarse-to-fine DPI pass must not change any verdict: both checkers give
+the same overall and per-page statuses with adaptive_dpi on and off, on a
+small corpus from benchmarks/make_corpus.py (forms, reports and scans).
+"""
+
+import os
+
+import pytest
+
+from app.services import checker_engine, internship_report_checker, signaturechecker
+from benchmarks.check_adaptive_dpi import page_statuses
+from benchmarks.make_corpus import write_corpus
+
+PROFILES = [signaturechecker.PROFILE, internship_report_checker.PROFILE]
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    out = tmp_path_factory.mktemp("corpus")
+    truth = write_corpus(str(out), count=4, scans=3, seed=1)
+    return str(out), sorted(truth)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def single_process_fallback():
+    # keep the fallback scan in the test process
+    saved = checker_engine.FALLBACK_MAX_WORKERS
+    checker_engine.FALLBACK_MAX_WORKERS = 1
+    yield
+    checker_engine.FALLBACK_MAX_WORKERS = saved
+
+
+@pytest.mark.parametrize("profile", PROFILES, ids=lambda p: p.name)
+def test_adaptive_matches_fixed_dpi(corpus, profile):
+    directory, names = corpus
+    assert profile.adaptive_dpi
+    fixed_profile = profile.model_copy(update={"adaptive_dpi": False})
+    coarse_pages = 0
+    for name in names:
+        path = os.path.join(directory, name)
+        adaptive = checker_engine.run_checker(profile, path)
+        fixed = checker_engine.run_checker(fixed_profile, path)
+        assert adaptive["overall_status"] == fixed["overall_status"], name
+        assert page_statuses(adaptive) == page_statuses(fixed), name
+        coarse_pages += sum(1 for p in adaptive["pages"] if p.get("dpi") == profile.coarse_dpi)
+    # the comparison is moot if the coarse pass never decided a page
+    assert coarse_pages
@@ -0,0 +1,128 @@
+"""
+Signature form fields (AcroForm /Sig) are checked before any label search:
+a digitally signed field settles the document without rendering, unsigned
+fields are searched for ink in their rect. Covers fields merged with their
+widget and split field/widget objects (/V on the /Parent field).
+"""
+
+import random
+import zlib
+from typing import List, Optional
+
+import pytest
+
+from app.services import checker_engine, internship_report_checker, signaturechecker
+from benchmarks.make_corpus import PAGE_H, PAGE_W, _scribble, form_page
+
+PROFILES = [signaturechecker.PROFILE, internship_report_checker.PROFILE]
+
+SIG_VALUE = (
+    b"<< /Type /Sig /Filter /Adobe.PPKLite /SubFilter /adbe.pkcs7.detached "
+    b"/ByteRange [0 10 20 10] /Contents <3082010a0282010100c4> >>"
+)
+
+
+def build_pdf(fields: List[dict]) -> bytes:
+    """
+    One-page form with signature fields. Each field: {"name", "rect",
+    "signed", "inked", "split" (widget is a kid of the field),
+    "group" (field nested under a plain, non-/Sig parent of that name)}.
+    """
+    objs: List[Optional[bytes]] = []
+
+    def add(body: Optional[bytes]) -> int:
+        objs.append(body)
+        return len(objs)
+
+    rng = random.Random(0)
+    content = form_page(rng, signed=False, table=False)
+    for f in fields:
+        if f.get("inked"):
+            x1, y1, x2, y2 = f["rect"]
+            content += "\n" + _scribble(rng, x1 + 10, y1 + 5, x2 - x1 - 40, y2 - y1 - 10)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(None)
+    data = zlib.compress(content.encode("latin-1"))
+    stream = add(f"<< /Length {len(data)} /Filter /FlateDecode >>\nstream\n".encode() + data + b"\nendstream")
+    page = add(None)
+
+    widgets, top_fields = [], []
+    for f in fields:
+        value = f" /V {add(SIG_VALUE)} 0 R" if f.get("signed") else ""
+        rect = " ".join(str(v) for v in f["rect"])
+        group = add(None) if f.get("group") else None
+        parent = f" /Parent {group} 0 R" if group else ""
+        if f.get("split"):
+            field = add(None)
+            widget = add(f"<< /Type /Annot /Subtype /Widget /Rect [{rect}] /P {page} 0 R /Parent {field} 0 R /F 4 >>".encode())
+            objs[field - 1] = f"<< /FT /Sig /T ({f['name']}){value}{parent} /Kids [{widget} 0 R] >>".encode()
+        else:
+            field = widget = add(
+                f"<< /Type /Annot /Subtype /Widget /FT /Sig /T ({f['name']}){value}{parent} "
+                f"/Rect [{rect}] /P {page} 0 R /F 4 >>".encode()
+            )
+        if group:
+            objs[group - 1] = f"<< /T ({f['group']}) /Kids [{field} 0 R] >>".encode()
+        widgets.append(widget)
+        top_fields.append(group or field)
+
+    annots = " ".join(f"{w} 0 R" for w in widgets)
+    objs[page - 1] = (
+        f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+        f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {stream} 0 R /Annots [{annots}] >>"
+    ).encode()
+    objs[pages_id - 1] = f"<< /Type /Pages /Kids [{page} 0 R] /Count 1 >>".encode()
+    acro = " ".join(f"{f} 0 R" for f in top_fields)
+    catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R /AcroForm << /Fields [{acro}] /SigFlags 3 >> >>".encode())
+
+    out = bytearray(b"%PDF-1.7\n")
+    offsets = []
+    for i, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+SUPERVISOR = {"name": "Supervisor", "rect": (220, 300, 440, 340)}
+STUDENT = {"name": "Student", "rect": (220, 500, 440, 540)}
+
+# (fields, overall_status, signed_fields, [(hit label, digitally_signed, status)])
+CASES = {
+    "blank": ([SUPERVISOR], "NOT_FOUND", 0, [("Supervisor", False, "NOT_FOUND")]),
+    "inked": ([{**SUPERVISOR, "inked": True}], "FOUND", 0, [("Supervisor", False, "FOUND")]),
+    "signed": ([{**SUPERVISOR, "signed": True}], "FOUND", 1, [("Supervisor", True, "FOUND")]),
+    "signed_split": ([{**SUPERVISOR, "signed": True, "split": True}], "FOUND", 1, [("Supervisor", True, "FOUND")]),
+    "inked_split": ([{**SUPERVISOR, "inked": True, "split": True}], "FOUND", 0, [("Supervisor", False, "FOUND")]),
+    # only top-level /Sig fields are counted by pdfium: the unsigned nested
+    # field must not be reported as signed along with the signed one
+    "signed_and_nested_blank": (
+        [{**STUDENT, "signed": True}, {**SUPERVISOR, "group": "Approvals"}],
+        "FOUND", 1, [("Student", True, "FOUND")],
+    ),
+}
+
+
+@pytest.mark.parametrize("profile", PROFILES, ids=lambda p: p.name)
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_signature_field_verdicts(tmp_path, profile, case):
+    fields, overall, signed_fields, hits = CASES[case]
+    path = tmp_path / f"{case}.pdf"
+    path.write_bytes(build_pdf(fields))
+
+    report = checker_engine.run_checker(profile, str(path))
+
+    assert report["mode"] == "SIGNATURE_FIELD"
+    assert report["overall_status"] == overall
+    assert report["signed_fields"] == signed_fields
+    got = [
+        (hit["label_or_pattern"], hit["digitally_signed"], hit["status"])
+        for page in report["pages"]
+        for hit in page["hits"]
+    ]
+    assert got == hits
@@ -197,4 +197,12 @@ CREATE TABLE IF NOT EXISTS pending_registration (
 );
 
 CREATE INDEX idx_pending_expires ON pending_registration (expires_at);
-CREATE INDEX idx_assignment_run_ta_ta ON assignment_run_ta (ta_id, run_id);
\ No newline at end of file
+CREATE INDEX idx_assignment_run_ta_ta ON assignment_run_ta (ta_id, run_id);
+-- shared data version counters behind the ETags of the API (app/core/data_version.py)
+CREATE TABLE IF NOT EXISTS data_version (
+  resource VARCHAR(64) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0
+);
+-- random id of this database, part of every ETag: validators issued for a
+-- recreated database never match
+INSERT IGNORE INTO data_version (resource, version) VALUES ('@db', ROUND(RAND() * 1000000000000000));
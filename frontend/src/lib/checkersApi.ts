@@ -13,6 +13,10 @@ export type CheckerHit = {
   label_box_px: number[] | null;
   right_roi_px: number[] | null;
   below_roi_px: number[] | null;
+  // SIGNATURE_FIELD mode: the form field's rect and the padded ROI checked around it
+  field_box_px?: number[] | null;
+  field_roi_px?: number[] | null;
+  digitally_signed?: boolean;
   candidates: CheckerCandidate[];
 };
 
@@ -20,16 +24,21 @@ export type CheckerPage = {
   page: number;
   page_status: "FOUND" | "NOT_FOUND";
   hits: CheckerHit[];
+  // fallback scan: page rejected by the blank / typed-text-only prescreen
+  skipped?: "BLANK" | "TEXT_ONLY";
 };
 
 export type CheckerReport = {
   ok: boolean;
   checker: "comp590" | "comp291-391";
   file: string;
+  page_count?: number;
   mode: string | null;
   overall_status: "FOUND" | "NOT_FOUND";
   pages: CheckerPage[];
-  debug?: { out_dir?: string };
+  skipped_pages?: number;
+  signed_fields?: number;
+  debug?: { files?: string[] };
 };
 
 export async function uploadPdfToChecker(type: CheckerType, file: File, debug = false) {